@@ -2,6 +2,14 @@
 This module provides a simple database that establishes associations between a vanilla Minecraft block/item's numerical and string IDs.
 Currently only blocks/items in Minecraft 1.7.10 are listed.
 """
+import sys
+
+#Interns every value in the given dict, d.
+#Names read from a world's FML item data are interned as well (see World.getBlockName), so equal names share a single str object
+#and comparisons / dict lookups between them succeed on identity alone, without comparing characters.
+def _internValues( d ):
+    for k, v in d.items():
+        d[k] = sys.intern( v )
 
 #Mapping of numerical block IDs to their string IDs:
 _blockIDtoName = {
@@ -178,6 +186,8 @@ _blockIDtoName = {
     175: "minecraft:double_plant"
 }
 
+_internValues( _blockIDtoName )
+
 #Mapping of string block IDs to their numerical IDs:
 _blockNameToID = dict( reversed( item ) for item in _blockIDtoName.items() )
 
@@ -504,5 +514,7 @@ _itemIDtoName = {
     2267: "minecraft:record_wait"
 }
 
+_internValues( _itemIDtoName )
+
 #Mapping of string item IDs to their numerical IDs:
 _itemNameToID = dict( reversed( item ) for item in _itemIDtoName.items() )
@@ -5,6 +5,9 @@ import sys
 #Path to the Minecraft installation directory
 _mcPath = None
 
+#Cached return value of getDefaultMinecraftDir()
+_defaultMcPath = None
+
 def setMinecraftDir( path ):
     """
     Sets the path returned by getMinecraftPath().
@@ -18,15 +21,22 @@ def getDefaultMinecraftDir():
     Raise an Exception if the operating system is not supported.
     JNBT supports Windows, Linux, and Mac OS X.
     """
+    global _defaultMcPath
+    path = _defaultMcPath
+    if path is not None:
+        return path
+
     name = sys.platform
     if   name == "win32":
-        return os.path.join( os.environ["appdata"], ".minecraft" )
+        path = os.path.join( os.environ["appdata"], ".minecraft" )
     elif name == "linux":
-        return os.path.expanduser( os.path.join( "~", ".minecraft" ) )
+        path = os.path.expanduser( os.path.join( "~", ".minecraft" ) )
     elif name == "darwin": #Mac OS X
-        return os.path.expanduser( os.path.join( "~", "Library", "Application Support", "minecraft" ) )
+        path = os.path.expanduser( os.path.join( "~", "Library", "Application Support", "minecraft" ) )
     else:
         raise Exception( "Cannot find .minecraft directory; unsupported operating system." )
+    _defaultMcPath = path
+    return path
 
 def getMinecraftPath( *args ):
     """
@@ -38,6 +48,10 @@ def getMinecraftPath( *args ):
         jnbt.getMinecraftPath( "saves", "New World" )
         "C:\\Users\\<your username>\\AppData\\Roaming\\.minecraft\\saves\\New World"
     """
-    if _mcPath == None:
-        setMinecraftDir( getDefaultMinecraftDir() )
-    return os.path.join( _mcPath, *args )
\ No newline at end of file
+    path = _mcPath
+    if path is None:
+        path = getDefaultMinecraftDir()
+        setMinecraftDir( path )
+    if not args:
+        return path
+    return os.path.join( path, *args )
\ No newline at end of file
@@ -2,12 +2,20 @@
 
 import os
 import os.path
+import sys
+import gzip
 import zlib
+import mmap
 import re
 from io import BytesIO
+from struct import Struct
+from itertools import compress, islice
+from collections import deque
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
 
 from jnbt           import tag
-from jnbt.shared    import scandir, read as _r, readUnsignedByte as _rub, readUnsignedInt as _rui, readUnsignedInts as _ruis
+from jnbt.shared    import scandir, NBTFormatError, _UI
 from jnbt.mc.data   import _blockIDtoName, _blockNameToID, _itemIDtoName, _itemNameToID
 from jnbt.mc.player import Player
 
@@ -93,6 +101,31 @@ CACHE = object()
 #      How the chunk is compressed. 1 = gzip, 2 = zlib.
 #      See COMPRESSION_* enums above.
 
+_LOCATIONS   = Struct( ">1024I" )  #1024 locations (or timestamps) in a region header
+_CHUNKHEADER = Struct( ">IB"    )  #Chunk header (size + compression)
+
+#Key function for sorting chunks by their offset within their region file
+_getOffset = attrgetter( "offset" )
+
+#Memory-maps the region file at the given path for reading and returns the mmap.
+#Reading the header and chunks out of the mmap is just slicing memory; there's no seek() / read() call (and syscall) per access.
+#Raises EOFError if the file is too small to contain a region header.
+def _mapRegion( path ):
+    with open( path, "rb" ) as file:
+        if os.fstat( file.fileno() ).st_size < 8192:
+            raise EOFError( "End of file reached prematurely!" )
+        return mmap.mmap( file.fileno(), 0, access=mmap.ACCESS_READ )
+
+#Tells the OS that we're about to read the given mmap from start to finish, so it can start reading ahead (asynchronously and more aggressively than usual).
+#mmap.madvise() only exists in Python 3.8+ and on platforms that support it; elsewhere this does nothing.
+if hasattr( mmap.mmap, "madvise" ) and hasattr( mmap, "MADV_SEQUENTIAL" ) and hasattr( mmap, "MADV_WILLNEED" ):
+    def _adviseSequential( m ):
+        m.madvise( mmap.MADV_SEQUENTIAL )
+        m.madvise( mmap.MADV_WILLNEED )
+else:
+    def _adviseSequential( m ):
+        pass
+
 #Returns the nibble (a 4-bit value in the range [0,15]) in the given byte array, b, at the given index, i.
 #Note: i is a nibble index, not a byte index. A single byte stores two nibbles, so for a byte array with 2048 bytes, there are 4096 nibbles.
 #This function assumes little-endian ordering of nibbles within the bytes they're stored in:
@@ -103,6 +136,18 @@ def _n( b, i ):
     #Note: bytearray has unsigned bytes in range [0,255]
     return ( b[i//2] & 0x0F ) if (i & 1) == 0 else ( b[i//2] >> 4 )
 
+#Lookup tables for _unpackNibbles() that map a byte to its lower and upper nibble, respectively.
+_LOWER_NIBBLE = bytes( b & 0x0F for b in range( 256 ) )
+_UPPER_NIBBLE = bytes( b >> 4   for b in range( 256 ) )
+
+#Unpacks every nibble in the given byte array, b, at once; this is much faster than calling _n() for each nibble individually.
+#Returns a bytearray twice as long as b, where the byte at index i is the nibble _n( b, i ) would return.
+def _unpackNibbles( b ):
+    u = bytearray( 2 * len( b ) )
+    u[0::2] = b.translate( _LOWER_NIBBLE )
+    u[1::2] = b.translate( _UPPER_NIBBLE )
+    return u
+
 
 
 
@@ -198,16 +243,18 @@ class _BaseWorld:
         if playerdata:
             path = os.path.join( self.path, "playerdata" )
             if os.path.isdir( path ):
+                fullmatch = RE_PLAYERDATA_FILE.fullmatch
                 for entry in scandir( path ):
-                    match = RE_PLAYERDATA_FILE.fullmatch( entry.name )
+                    match = fullmatch( entry.name )
                     if match:
                         yield Player( entry.path, uuid="".join( match.groups() ) )
         #Search <world>/players/
         if players:
             path = os.path.join( self.path, "players" )
             if os.path.isdir( path ):
+                fullmatch = RE_PLAYERS_FILE.fullmatch
                 for entry in scandir( path ):
-                    match = RE_PLAYERS_FILE.fullmatch( entry.name )
+                    match = fullmatch( entry.name )
                     if match:
                         yield Player( entry.path, name=match.group(1) )
 
@@ -312,7 +359,7 @@ class _BaseWorld:
                     #Key is the internal name of the block/item, prepended with "\x01" for blocks and "\x02" for items
                     key = str( entry["K"] )
                     if key.startswith( "\x01" ):
-                        key = key[1:]
+                        key = sys.intern( key[1:] )
                         value = int( entry["V"] )
                         bIDtoN[ value ] = key
                         bNtoID[ key   ] = value
@@ -345,7 +392,7 @@ class _BaseWorld:
                     #Key is the internal name of the block/item, prepended with "\x01" for blocks and "\x02" for items
                     key = str( entry["K"] )
                     if key.startswith( "\x02" ):
-                        key = key[1:]
+                        key = sys.intern( key[1:] )
                         value = int( entry["V"] )
                         iIDtoN[ value ] = key
                         iNtoID[ key   ] = value
@@ -426,7 +473,7 @@ class _BaseDimension:
     Represents a dimension.
     A dimension consists of a sparsely populated, practically infinite grid of regions.
     """
-    __slots__ = ( "id", "path", "world", "_regions" )
+    __slots__ = ( "id", "path", "world", "_regionDir", "_regions", "_lastRegion" )
 
     #Subclasses should override these
     formatid     = None
@@ -445,27 +492,29 @@ class _BaseDimension:
         self.path     = path
         self.world    = world
         self.id       = id
-        self._regions = CACHE
+        self._regionDir  = os.path.join( path, "region" )  #Path to the directory containing this dimension's region files
+        self._regions    = CACHE
+        self._lastRegion = ( None, None, None )  #( rx, rz, region ) for the most recent call to getRegion()
 
     def iterRegions( self ):
         """Iterates over every region in this dimension."""
-        path = os.path.join( self.path, "region" )
+        path = self._regionDir
         if not os.path.isdir( path ):
             return
 
-        reFilename = self._reFilename
-        clsRegion  = self._clsRegion
+        fullmatch = self._reFilename.fullmatch
+        clsRegion = self._clsRegion
 
         for entry in scandir( path ):
-            if entry.is_file():
-                match = reFilename.fullmatch( entry.name )
-                if match:
-                    yield clsRegion(
-                        int( match.group( 1 ) ),
-                        int( match.group( 2 ) ),
-                        entry.path,
-                        self
-                    )
+            #Match the name first; unlike is_file(), this never needs a stat() call, and most non-region files fail on the first character.
+            match = fullmatch( entry.name )
+            if match and entry.is_file():
+                yield clsRegion(
+                    int( match.group( 1 ) ),
+                    int( match.group( 2 ) ),
+                    entry.path,
+                    self
+                )
 
     def iterChunks( self, *, content=True ):
         """
@@ -485,6 +534,12 @@ class _BaseDimension:
         Returns the region in this dimension with the given region coordinates, (rx, rz).
         Returns None if there is no region with these coordinates.
         """
+        #Consecutive calls tend to ask for the same region (e.g. getBlock() on nearby blocks), so check the last region we returned first.
+        #This is cheaper than building a key tuple, hashing it, and looking it up in the cache.
+        last = self._lastRegion
+        if last[0] == rx and last[1] == rz:
+            return last[2]
+
         #Return the cached value for these region coordinates, if any
         regions = self._regions
         if regions is CACHE:
@@ -492,10 +547,11 @@ class _BaseDimension:
         else:
             r = regions.get( ( rx, rz ), CACHE )
             if r is not CACHE:
+                self._lastRegion = ( rx, rz, r )
                 return r
 
         #Check if this dimension has a region at the given coordinates
-        path = os.path.join( self.path, "region", self._fmtFilename.format( rx, rz ) )
+        path = os.path.join( self._regionDir, self._fmtFilename.format( rx, rz ) )
         
         #If it exists, cache a new Region object
         if os.path.isfile( path ):
@@ -506,6 +562,7 @@ class _BaseDimension:
 
         #Cache the value, then return it
         regions[ rx, rz ] = r
+        self._lastRegion = ( rx, rz, r )
         return r        
 
     def getChunk( self, cx, cz, *, content=True ):
@@ -514,46 +571,43 @@ class _BaseDimension:
         Returns None if there is no chunk with these coordinates.
         See help( jnbt.Region.getChunk ) for information on content.
         """
-        rx, cx = divmod( cx, 32 )
-        rz, cz = divmod( cz, 32 )
-        region = self.getRegion( rx, rz )
+        #Regions are 32x32 chunks, so shifts and masks give us the same results as divmod (negative coordinates included)
+        region = self.getRegion( cx >> 5, cz >> 5 )
         if region is None:
             return None
-        return region.getChunk( cx, cz, content=content )
+        return region.getChunk( cx & 31, cz & 31, content=content )
 
     def getBlock( self, x, y, z ):
         """
         Returns the block in this dimension at the given block coordinates, (x, y, z).
         Returns None if there is no block at these coordinates.
         """
-        cx,  x = divmod(  x, 16 )
-        cz,  z = divmod(  z, 16 )
-        rx, cx = divmod( cx, 32 )
-        rz, cz = divmod( cz, 32 )
-        region = self.getRegion( rx, rz )
+        #Chunks are 16x16 blocks and regions are 32x32 chunks, so shifts and masks give us the same results as divmod (negative coordinates included)
+        cx = x >> 4
+        cz = z >> 4
+        region = self.getRegion( cx >> 5, cz >> 5 )
         if region is None:
             return None
-        chunk = region.getChunk( cx, cz )
+        chunk = region.getChunk( cx & 31, cz & 31 )
         if chunk is None:
             return None
-        return chunk.getBlock( x, y, z )
+        return chunk.getBlock( x & 15, y, z & 15 )
 
     def getBiome( self, x, z ):
         """
         Returns the biome ID in this dimension at the given block coordinates, (x, z).
         Returns None if there is no chunk at these coordinates.
         """
-        cx,  x = divmod(  x, 16 )
-        cz,  z = divmod(  z, 16 )
-        rx, cx = divmod( cx, 32 )
-        rz, cz = divmod( cz, 32 )
-        region = self.getRegion( rx, rz )
+        #Chunks are 16x16 blocks and regions are 32x32 chunks, so shifts and masks give us the same results as divmod (negative coordinates included)
+        cx = x >> 4
+        cz = z >> 4
+        region = self.getRegion( cx >> 5, cz >> 5 )
         if region is None:
             return None
-        chunk = region.getChunk( cx, cz )
+        chunk = region.getChunk( cx & 31, cz & 31 )
         if chunk is None:
             return None
-        return chunk.getBiome( x, z )
+        return chunk.getBiome( x & 15, z & 15 )
 
     def getRegions( self ):
         """Returns a dictionary of regions keyed by region coordinates."""
@@ -583,7 +637,7 @@ class _BaseDimension:
 
 
 class _BaseRegion:
-    __slots__ = ( "x", "z", "path", "dimension", "_chunks", "_length" )
+    __slots__ = ( "x", "z", "path", "dimension", "_chunks", "_length", "_lastChunk" )
 
     #Subclasses should override these
     formatid  = None
@@ -604,8 +658,9 @@ class _BaseRegion:
         self.path = path
         self.dimension = dimension
 
-        self._chunks = CACHE  #Cached chunks
-        self._length = CACHE  #Number of chunks in this region
+        self._chunks    = CACHE                 #Cached chunks
+        self._length    = CACHE                 #Number of chunks in this region
+        self._lastChunk = ( None, None, None )  #( cx, cz, chunk ) for the most recent call to getChunk()
 
     def getWorld( self ):
         """Return the world this region belongs to."""
@@ -614,64 +669,101 @@ class _BaseRegion:
             return r.world
     world = property( getWorld )
 
-    def _readChunks( self, file ):
+    def _readChunks( self, buf ):
         """
-        Reads chunks from the given readable file-like object, file.
+        Reads chunks from the region header in buf, a buffer (e.g. an mmap) containing the region file.
         Returns a _clsChunk list sorted by offset in ascending order.
         """
 
-        #Map of regional index -> chunk
-        i2c = {}
-
         #Read locations and timestamps
-        locations  = _ruis( file, 1024 )
-        timestamps = _ruis( file, 1024 )
-
-        for i in range( 1024 ):
-            loc = locations[i]
-
-            if loc == 0:
-                continue
-
-            offset    = 4096 * ( ( loc & 0xFFFFFF00 ) >> 8 )
-            allocsize = 4096 * ( ( loc & 0x000000FF )      )
+        locations  = _LOCATIONS.unpack_from( buf, 0    )
+        timestamps = _LOCATIONS.unpack_from( buf, 4096 )
 
-            z,x = divmod( i, 32 )
+        clsChunk = self._clsChunk
+        rx = 32 * self.x
+        rz = 32 * self.z
 
-            c = self._clsChunk(
-                32 * self.x + x,
-                32 * self.z + z,
+        #Only visit the indices of chunks that exist (i.e. those with a nonzero location)
+        chunks = []
+        for i in compress( range( 1024 ), locations ):
+            loc = locations[i]
+            x = i & 31
+            z = i >> 5
+            chunks.append( clsChunk(
+                rx + x,
+                rz + z,
                 x,
                 z,
-                offset,
-                allocsize,
+                4096 * ( loc >> 8   ),  #offset
+                4096 * ( loc & 0xFF ),  #allocsize
                 timestamps[ i ],
                 None,
                 None,
                 None,
                 self
-            )
-
-            i2c[i] = c
+            ) )
 
         #Return a list of chunks sorted by offset (so we're always reading in a forward direction)
-        return sorted( i2c.values(), key=lambda c: c.offset )
+        chunks.sort( key=_getOffset )
+        return chunks
 
     def iterChunks( self, *, content=True ):
         """
         Iterates over every chunk in this region.
         See help( jnbt.Region.getChunk ) for information on content.
         """
-        with open( self.path, "rb" ) as file:
-            chunks = self._readChunks( file )
+        with _mapRegion( self.path ) as buf:
+            chunks = self._readChunks( buf )
 
             if content:
+                #Chunks are sorted by offset, so we'll be reading the file in a forward direction
+                _adviseSequential( buf )
                 for c in chunks:
-                    c._read( file )
+                    c._read( buf )
                     yield c
             else:
                 yield from chunks
 
+    def iterChunksParallel( self, workers=None ):
+        """
+        Iterates over every chunk in this region, reading their contents.
+        This is equivalent to iterChunks( content=True ) but decompresses chunks on several threads at once.
+        zlib releases the GIL while it decompresses, so on a multi-core machine this can be considerably faster. Parsing the decompressed NBT still happens on the calling thread.
+        Chunks are yielded in the same order as iterChunks().
+
+        workers is an optional parameter that determines the maximum number of threads to use. Defaults to None.
+            If this is None, the same number of threads ThreadPoolExecutor would use by default is used.
+        Note: Decompression runs ahead of iteration by up to 2*workers chunks, so this holds somewhat more of the region in memory at once than iterChunks() does.
+        """
+        if workers is None:
+            workers = min( 32, ( os.cpu_count() or 1 ) + 4 )
+
+        with _mapRegion( self.path ) as buf:
+            chunks = iter( self._readChunks( buf ) )
+            _adviseSequential( buf )
+
+            #Chunks waiting to be yielded, paired with the futures decompressing them, in the order they'll be yielded.
+            #Only a limited number of chunks are submitted at a time; each time we yield one, another is submitted in its place.
+            #This bounds memory use when the caller is slower than decompression, and limits the work left over if the caller stops iterating early.
+            pending = deque()
+            executor = ThreadPoolExecutor( workers )
+            try:
+                for c in islice( chunks, 2 * workers ):
+                    pending.append( ( c, executor.submit( c._inflate, buf ) ) )
+                while pending:
+                    c, future = pending.popleft()
+                    contents = future.result()
+                    for n in islice( chunks, 1 ):
+                        pending.append( ( n, executor.submit( n._inflate, buf ) ) )
+                    c._load( *contents )
+                    yield c
+            finally:
+                #If iteration ended early (e.g. the generator was closed), don't bother decompressing chunks that haven't been started yet.
+                #Chunks that are being decompressed must still finish before buf is unmapped.
+                for c, future in pending:
+                    future.cancel()
+                executor.shutdown( wait=True )
+
     def iterBlocks( self ):
         """Iterates over every block in every chunk in this region."""
         for chunk in self.iterChunks( content=True ):
@@ -686,6 +778,13 @@ class _BaseRegion:
             Reading chunk contents is an expensive operation, so if you don't plan to use them, give False for this argument.
             Defaults to True.
         """
+        #Consecutive calls tend to ask for the same chunk (e.g. getBlock() on nearby blocks), so check the last chunk we returned first.
+        last = self._lastChunk
+        if last[0] == cx and last[1] == cz:
+            c = last[2]
+            if not content or c is None or c.nbt is not None:
+                return c
+
         #Return the cached value for these chunk coordinates, if any
         chunks = self._chunks
         if chunks is CACHE:
@@ -694,17 +793,17 @@ class _BaseRegion:
             c = chunks.get( ( cx, cz ), CACHE )
             if c is not CACHE:
                 if content and c is not None and c.nbt is None:
-                    with open( self.path, "rb" ) as file:
-                        c._read( file )
+                    with _mapRegion( self.path ) as buf:
+                        c._read( buf )
+                self._lastChunk = ( cx, cz, c )
                 return c
 
         #Read, cache, and return the chunk
-        with open( self.path, "rb" ) as file:
+        with _mapRegion( self.path ) as buf:
             i4 = 4*(cx + 32*cz)
 
             #Read location
-            file.seek( i4, os.SEEK_SET )
-            loc = _rui( file )
+            loc = _UI.unpack_from( buf, i4 )[0]
             #If it doesn't exist, cache None so we don't have to check next time
             if loc == 0:
                 c = None
@@ -714,8 +813,7 @@ class _BaseRegion:
                 allocsize = 4096 * ( ( loc & 0x000000FF )      )
 
                 #Read timestamp
-                file.seek( 4096 + i4, os.SEEK_SET )
-                timestamp = _rui( file )
+                timestamp = _UI.unpack_from( buf, 4096 + i4 )[0]
 
                 #Read chunk header
                 c = self._clsChunk(
@@ -732,10 +830,11 @@ class _BaseRegion:
                     self
                 )
                 if content:
-                    c._read( file )
+                    c._read( buf )
 
         #Cache the value, then return it
         chunks[ cx, cz ] = c
+        self._lastChunk = ( cx, cz, c )
         return c
 
     def getChunks( self, *, content=True ):
@@ -760,12 +859,9 @@ class _BaseRegion:
         """
         l = self._length
         if l is CACHE:
-            l = 0
-            with open( self.path, "rb" ) as file:
-                locations  = _ruis( file, 1024 )
-                for location in locations:
-                    if location != 0:
-                        l += 1
+            with _mapRegion( self.path ) as buf:
+                #Chunks that haven't been generated have a location of 0
+                l = 1024 - _LOCATIONS.unpack_from( buf, 0 ).count( 0 )
             self._length = l
         return l
 
@@ -790,7 +886,7 @@ class _BaseRegion:
 #Each chunk stores detailed information about a small area of the world.
 #This includes block, lighting, and heightmap data, but also non-block data such as save data for entities and tile entities within their bounds.
 class _BaseChunk:
-    __slots__ = ( "x", "z", "lx", "lz", "offset", "allocsize", "timestamp", "size", "compression", "nbt", "region", "_tileEntities" )
+    __slots__ = ( "x", "z", "lx", "lz", "offset", "allocsize", "timestamp", "size", "compression", "nbt", "region", "_world", "_tileEntities", "_sections" )
 
     #Subclasses should override this
     formatid = None
@@ -814,7 +910,9 @@ class _BaseChunk:
         self.nbt         = nbt          #An NBTDocument containing the contents of the chunk.
         self.region      = region       #Reference to the region this chunk is a part of
 
+        self._world        = None  #World this chunk belongs to; memoized by getWorld()
         self._tileEntities = None
+        self._sections     = None  #Format-specific block data looked up by getBlock(); built on demand by subclasses
 
     def getDimension( self ):
         """Returns the dimension this chunk belongs to."""
@@ -825,11 +923,14 @@ class _BaseChunk:
 
     def getWorld( self ):
         """Returns the world this chunk belongs to."""
-        r = self.region
-        if r is not None:
-            r = r.dimension
+        w = self._world
+        if w is None:
+            r = self.region
             if r is not None:
-                return r.world
+                r = r.dimension
+                if r is not None:
+                    w = self._world = r.world
+        return w
     world = property( getWorld )
 
     def getTileEntities( self ):
@@ -868,6 +969,14 @@ class _BaseChunk:
         """
         return self.nbt["Level"]["Biomes"][16 * z + x]
 
+    def getBiomes( self ):
+        """
+        Returns the biome IDs of every block column in this chunk as a sequence of 256 ints, indexed in ZX order (i.e. 16*z + x).
+        This is the chunk's biome data itself rather than a copy, so it's much faster than calling getBiome() for each column.
+        """
+        return self.nbt["Level"]["Biomes"]
+    biomes = property( getBiomes )
+
     def getBlock( self, x, y, z ):
         """
         Returns data about the block at block coordinates (x, y, z) relative to the chunk.
@@ -877,37 +986,51 @@ class _BaseChunk:
         """
         raise NotImplementedError()
 
-    def _read( self, file ):
-        """Read chunk contents from the given readable file-like object, file."""
-        #Read chunk header
-        file.seek( self.offset, os.SEEK_SET )
-
-        size        = _rui( file ) - 1
-        compression = _rub( file )
+    def _read( self, buf ):
+        """Read chunk contents from buf, a buffer (e.g. an mmap) containing the region file."""
+        self._load( *self._inflate( buf ) )
 
-        if compression == 2:
-            #TODO: Don't read entire file into memory; use zlib decompression objects
-            source = BytesIO( zlib.decompress( _r( file, size ) ) )
-        elif compression == 1:
-            source = gzip.GzipFile( fileobj=file )
-        else:
-            raise NBTFormatError( "Unrecognized compression type: {:d}.".format( compression ) )
+    def _inflate( self, buf ):
+        """
+        Reads the header of this chunk from buf, a buffer (e.g. an mmap) containing the region file, and decompresses the chunk's contents.
+        Returns a tuple, ( size, compression, data ), where data is a BytesIO containing the uncompressed NBT data.
+        Note: This doesn't modify the chunk, so it's safe to call from another thread.
+        """
+        #Read chunk header
+        start = self.offset + 5
+        if start > len( buf ):
+            raise EOFError( "End of file reached prematurely!" )
+        size, compression = _CHUNKHEADER.unpack_from( buf, self.offset )
+        size -= 1
+        end = start + size
+        if end > len( buf ):
+            raise EOFError( "End of file reached prematurely!" )
+
+        #Decompress the chunk straight out of buf; the memoryview avoids copying the compressed data first.
+        with memoryview( buf )[ start:end ] as data:
+            if compression == 2:
+                source = BytesIO( zlib.decompress( data ) )
+            elif compression == 1:
+                source = BytesIO( gzip.decompress( data ) )
+            else:
+                raise NBTFormatError( "Unrecognized compression type: {:d}.".format( compression ) )
 
-        #Read chunk data
-        nbt = tag.read( source, None )
+        return size, compression, source
 
+    def _load( self, size, compression, source ):
+        """Read chunk data from source, the BytesIO returned by _inflate()."""
+        self.nbt         = tag.read( source, None )
         self.size        = size
         self.compression = compression
-        self.nbt         = nbt
+        self._sections   = None
 
     def _free( self ):
         """Clear loaded chunk contents."""
-        self.nbt = None
+        self.nbt       = None
+        self._sections = None
 
     def _initTileEntities( self ):
-        te = {}
-        for tag in self.nbt["Level"]["TileEntities"]:
-            te[int(tag["x"]),int(tag["y"]),int(tag["z"])] = tag
+        te = { ( int( t["x"] ), int( t["y"] ), int( t["z"] ) ): t for t in self.nbt["Level"]["TileEntities"] }
         self._tileEntities = te
         return te
 
@@ -979,14 +1102,15 @@ class _BaseBlock:
         Return the name of the block, or None if not recognized.
         e.g. "minecraft:iron_ore"
         """
+        bid = self.id
         #Get name from leveldata if possible
         r = self.getWorld()
         if r is not None:
-            r = r.getBlockName( self.id )
+            r = r.getBlockName( bid )
             if r is not None:
                 return r
         #Get name from built-in Minecraft mappings if possible
-        return _blockIDtoName.get( self.id )
+        return _blockIDtoName.get( bid )
     name  = property( getName )
 
     def getMeta( self ):
@@ -1030,11 +1154,7 @@ class _BaseBlock:
         """Returns the world this block is a part of."""
         r = self.chunk
         if r is not None:
-            r = r.region
-            if r is not None:
-                r = r.dimension
-                if r is not None:
-                    return r.world
+            return r.getWorld()
     world = property( getWorld )
 
     def __repr__( self ):
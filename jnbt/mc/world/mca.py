@@ -10,19 +10,44 @@
 #    http://minecraft.gamepedia.com/Chunk_format
 
 import re
+from array import array
 
-from jnbt.mc.world.base import LVLFMT_ANVIL, _BaseWorld, _BaseDimension, _BaseRegion, _BaseChunk, _BaseBlock, _n
+from jnbt.shared        import SYS_IS_LITTLE_ENDIAN
+from jnbt.mc.world.base import LVLFMT_ANVIL, _BaseWorld, _BaseDimension, _BaseRegion, _BaseChunk, _BaseBlock, _n, _unpackNibbles
 
 #Regular expressions that matches Anvil filenames; i.e. filenames of the form "r.{x}.{z}.mca" (where x and z are region coordinates)
 RE_FILENAME  = re.compile( "^r\.(-?\d+)\.(-?\d+)\.mca$", re.IGNORECASE )
 FMT_FILENAME = "r.{:d}.{:d}.mca"
 NAME         = "anvil"
 
-def _getBlockIDWithAdd( index, blocks, add ):
-    return blocks[index] + ( _n( add, index ) << 8 )
+#Returns a function that takes the index of a block in a section with the given Blocks and Add byte arrays and returns its full block ID.
+#The function is specialized for the section: blocks and add are bound up front, and sections without Add data skip combining them entirely.
+def _makeBlockIDLookup( blocks, add ):
+    if not add:
+        return blocks.__getitem__
+    def getBlockID( index ):
+        return blocks[index] + ( _n( add, index ) << 8 )
+    return getBlockID
 
-def _getBlockIDWithoutAdd( index, blocks, add ):
-    return blocks[index]
+#Returns a function that takes the index of a block and returns its nibble in the given nibble array, b (e.g. a section's Data, BlockLight, or SkyLight).
+def _makeNibbleLookup( b ):
+    def getNibble( index ):
+        return ( b[index >> 1] >> ( ( index & 1 ) << 2 ) ) & 0x0F
+    return getNibble
+
+#Returns an array containing the full block ID of every block in a section with the given Blocks and Add byte arrays.
+#Each ID is built from 8 bits of Blocks (bits 0-7) and 4 bits of Add (bits 8-11).
+def _getBlockIDs( blocks, add ):
+    #Interleave Blocks and the unpacked Add nibbles, giving us a little-endian unsigned short for each block
+    ids = bytearray( 2 * len( blocks ) )
+    ids[0::2] = blocks
+    ids[1::2] = _unpackNibbles( add )
+
+    a = array( "H" )
+    a.frombytes( ids )
+    if not SYS_IS_LITTLE_ENDIAN:
+        a.byteswap()
+    return a
 
 class World( _BaseWorld ):
     __slots__ = ()
@@ -62,50 +87,100 @@ class Chunk( _BaseChunk ):
         block = Block( self )
         for section in self.nbt["Level"]["Sections"]:
             baseY = 16 * int( section["Y"] )
+            blocks = section["Blocks"]
             add = section.get("Add")
+            #We're visiting every block in the section, so work out every block ID, metadata and light value up front.
+            #This is much faster than combining Blocks and Add / extracting nibbles one block at a time.
+            if add:
+                blocks = _getBlockIDs( blocks, add )
+            data       = section["Data"]
+            blockLight = section["BlockLight"]
+            skyLight   = section["SkyLight"]
             sectionData = (
-                section["Blocks"],                                      #0
-                section["Data"],                                        #1
-                section["BlockLight"],                                  #2
-                section["SkyLight"],                                    #3
+                blocks,                                                 #0
+                data,                                                   #1
+                blockLight,                                             #2
+                skyLight,                                               #3
                 baseY,                                                  #4
                 add,                                                    #5
-                _getBlockIDWithAdd if add else _getBlockIDWithoutAdd,   #6
+                blocks.__getitem__,                                     #6
+                _unpackNibbles( data ).__getitem__,                     #7
+                _unpackNibbles( blockLight ).__getitem__,               #8
+                _unpackNibbles( skyLight ).__getitem__,                 #9
             )
             block._d = sectionData
             for i in range( 4096 ):
                 block._i = i
                 yield block
+    def iterSections( self ):
+        """
+        Generator that iterates over every section in this chunk.
+        For each section, yields a tuple, ( baseY, ids, meta, blockLight, skyLight ).
+        baseY is the Y coordinate of the section's bottom layer of blocks.
+        The remaining values are sequences of 4096 ints (one per block in the section) indexed in YZX order, i.e. 256*y + 16*z + x.
+
+        This is much faster than iterBlocks() when you only need raw block data, because no Block() is involved.
+        For example, to find the index of every iron ore block in each section:
+            for baseY, ids, meta, blockLight, skyLight in chunk.iterSections():
+                indices = [ i for i, id in enumerate( ids ) if id == 15 ]
+        """
+        for section in self.nbt["Level"]["Sections"]:
+            blocks = section["Blocks"]
+            add = section.get("Add")
+            yield (
+                16 * int( section["Y"] ),
+                _getBlockIDs( blocks, add ) if add else blocks,
+                _unpackNibbles( section["Data"] ),
+                _unpackNibbles( section["BlockLight"] ),
+                _unpackNibbles( section["SkyLight"] ),
+            )
     def getBlock( self, x, y, z ):
+        sections = self._sections
+        if sections is None:
+            sections = self._initSections()
+        sectionData = sections.get( y >> 4 )
+        if sectionData is None:
+            return None
+        return Block( self, sectionData, 256*(y & 15) + 16*z + x )
+    def _initSections( self ):
+        #Maps the Y index of each section (i.e. y >> 4 for the blocks within it) to the data getBlock() needs for blocks in that section.
+        #This saves getBlock() from having to search for the right section every time it's called.
+        sections = {}
         for section in self.nbt["Level"]["Sections"]:
-            baseY = 16 * int( section["Y"] )
-            if y >= baseY and y < baseY + 16:
-                add = section.get("Add")
-                sectionData = (
-                    section["Blocks"],
-                    section["Data"],
-                    section["BlockLight"],
-                    section["SkyLight"],
-                    baseY,
-                    add,
-                    _getBlockIDWithAdd if add else _getBlockIDWithoutAdd,
-                )
-                return Block( self, sectionData, 256*(y-baseY) + 16*z + x )
-        return None
+            sectionY   = int( section["Y"] )
+            blocks     = section["Blocks"]
+            data       = section["Data"]
+            blockLight = section["BlockLight"]
+            skyLight   = section["SkyLight"]
+            add        = section.get("Add")
+            sections[ sectionY ] = (
+                blocks,
+                data,
+                blockLight,
+                skyLight,
+                16 * sectionY,
+                add,
+                _makeBlockIDLookup( blocks, add ),
+                _makeNibbleLookup( data ),
+                _makeNibbleLookup( blockLight ),
+                _makeNibbleLookup( skyLight ),
+            )
+        self._sections = sections
+        return sections
     __iter__ = iterBlocks
 Region._clsChunk = Chunk
 
 class Block( _BaseBlock ):
+    __slots__ = ()
     formatid = LVLFMT_ANVIL
     format   = NAME
     def getPos( self ):
-        y, index = divmod( self._i, 256 )
-        z, x = divmod( index, 16 )
+        i = self._i
         c = self.chunk
         return (
-            16 * c.x   + x,
-            self._d[4] + y,
-            16 * c.z   + z
+            16 * c.x   + ( i & 15 ),
+            self._d[4] + ( i >> 8 ),
+            16 * c.z   + ( ( i >> 4 ) & 15 )
         )
     pos = property( getPos )
 
@@ -114,14 +189,32 @@ class Block( _BaseBlock ):
     x = property( getX )
 
     def getY( self ):
-        return self._d[4] + ( self._i // 256 )
+        return self._d[4] + ( self._i >> 8 )
     y = property( getY )
 
     def getZ( self ):
-        return 16 * self.chunk.z + ( ( self._i & 255 ) // 16 )
+        return 16 * self.chunk.z + ( ( self._i >> 4 ) & 15 )
     z = property( getZ )
 
     def getID( self ):
+        return self._d[6]( self._i )
+    id = property( getID )
+
+    def getMeta( self ):
+        return self._d[7]( self._i )
+    meta = property( getMeta )
+
+    def getBlockLight( self ):
+        return self._d[8]( self._i )
+    blockLight = property( getBlockLight )
+
+    def getSkyLight( self ):
+        return self._d[9]( self._i )
+    skyLight = property( getSkyLight )
+
+    def getLight( self ):
+        """Return the light level at this block's position."""
         d = self._d
-        return d[6]( self._i, d[0], d[5] )
-    id = property( getID )
\ No newline at end of file
+        i = self._i
+        return min( 15, d[8]( i ) + d[9]( i ) )
+    light = property( getLight )
\ No newline at end of file
@@ -77,21 +77,21 @@ class Chunk( _BaseChunk ):
 Region._clsChunk = Chunk
 
 class Block( _BaseBlock ):
+    __slots__ = ()
     formatid = LVLFMT_REGION
     format   = NAME
     def getPos( self ):
-        x, index = divmod( self._i, 2048 )
-        z, y = divmod( index, 128 )
+        i = self._i
         c = self.chunk
         return (
-            16 * c.x + x,
-                       y,
-            16 * c.z + z
+            16 * c.x + ( i >> 11 ),
+                       ( i & 127 ),
+            16 * c.z + ( ( i >> 7 ) & 15 )
         )
     pos = property( getPos )
 
     def getX( self ):
-        return 16 * self.chunk.x + self._i // 2048
+        return 16 * self.chunk.x + ( self._i >> 11 )
     x = property( getX )
 
     def getY( self ):
@@ -99,7 +99,7 @@ class Block( _BaseBlock ):
     y = property( getY )
 
     def getZ( self ):
-        return 16 * self.chunk.z + ( ( self._i & 2047 ) // 128 )
+        return 16 * self.chunk.z + ( ( self._i >> 7 ) & 15 )
     z = property( getZ )
 
     def getID( self ):
@@ -1,7 +1,7 @@
 import gzip
 import zlib
 
-from io import BytesIO
+from io import BufferedReader, BytesIO
 
 from jnbt.shared import (
     WrongTagError, OutOfBoundsError,
@@ -39,8 +39,11 @@ def parse( source, handler, compression="gzip" ):
     if isinstance( source, str ):
         if compression is None:
             file = open( source, "rb" )
+        #GzipFile.read() is implemented in Python and does a fair amount of bookkeeping on every call, and the parser makes several small reads per tag.
+        #Buffering it means most of those reads are served from the (C-implemented) BufferedReader instead.
+        #Unlike zlib, we don't decompress the whole file up front so that parse() can still stream large files.
         elif compression == "gzip":
-            file = gzip.open( source, "rb" )
+            file = BufferedReader( gzip.open( source, "rb" ), 131072 )
         elif compression == "zlib":
             with open( source, "rb" ) as hardfile:
                 file = BytesIO( zlib.decompress( hardfile.read() ) )
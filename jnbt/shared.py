@@ -1,7 +1,7 @@
 import os
 import sys
 import math
-from struct import calcsize, Struct
+from struct import calcsize, pack as _pack, Struct, error as _StructError
 from array import array
 
 #Tag Types
@@ -100,6 +100,28 @@ _F  = Struct( ">f"                    )     #Big-endian float (4 bytes)
 _D  = Struct( ">d"                    )     #Big-endian double (8 bytes)
 _UI = Struct( ">" + UNSIGNED_INT_TYPE )     #Unsigned big-endian int (4 bytes)
 
+#Struct format characters for tags with fixed-width payloads, indexed by tagType (None for every other tag).
+#A TAG_List of these tags can be packed / unpacked with a single ">{length}{format}" struct call rather than one call per tag.
+_FORMATS = (
+    None,               #TAG_End
+    "b",                #TAG_Byte
+    "h",                #TAG_Short
+    SIGNED_INT_TYPE,    #TAG_Int
+    "q",                #TAG_Long
+    "f",                #TAG_Float
+    "d",                #TAG_Double
+    None,               #TAG_Byte_Array
+    None,               #TAG_String
+    None,               #TAG_List
+    None,               #TAG_Compound
+    None,               #TAG_Int_Array
+    None                #TAG_Long_Array
+)
+
+#Structs for the fixed-width value at the start of each tag's payload, indexed by tagType (None for every other tag).
+#For TAG_Byte through TAG_Double this is the entire payload; for TAG_Byte_Array, TAG_Int_Array, and TAG_Long_Array, it's the array's length.
+_STRUCTS = ( None, _B, _S, _I, _L, _F, _D, _I, None, None, None, _I, _I )
+
 class NBTFormatError( Exception ):
     """This exception is raised when parsing, writing, or modifying data that violates the NBT specification."""
     pass
@@ -249,6 +271,23 @@ def readExpectedTagName( i, expected ):
         raise OutOfBoundsError( length, 0, 32768 )
     return read( i, length ).decode()
 
+#Maps ( tagType, name ) to the encoded named tag header for that tag.
+#The same handful of names ("id", "Pos", "Level", "Sections", etc) tend to be written over and over again, so this saves us from encoding them every time.
+#To keep memory bounded when writing many distinct names, headers stop being cached once there are _MAX_HEADERS of them.
+_headers = {}
+_MAX_HEADERS = 4096
+
+def _header( tagType, name ):
+    """Returns the encoded header for a tag with the given tagType and name, caching it in _headers if there's room."""
+    k = ( tagType, name )
+    h = _headers.get( k )
+    if h is None:
+        b = name.encode()
+        h = _NT.pack( tagType, len( b ) ) + b
+        if len( _headers ) < _MAX_HEADERS:
+            _headers[ k ] = h
+    return h
+
 #_wtn
 def writeTagName( tagType, name, o ):
     """
@@ -256,9 +295,21 @@ def writeTagName( tagType, name, o ):
     tagType is the numerical ID of the tag directly following this header.
     name is the name of the tag.
     """
-    b = name.encode()
-    o.write( _NT.pack( tagType, len( b ) ) )
-    o.write( b )
+    h = _header( tagType, name )
+    #Write the header in one go; this is much cheaper than two separate writes, especially on compressed streams.
+    o.write( h )
+
+#_wnv
+def writeNamedValue( tagType, name, v, o ):
+    """
+    Writes a named tag header followed by the fixed-width value at the start of the tag's payload.
+    tagType is the numerical ID of the tag and name is its name.
+    For TAG_Byte, TAG_Short, TAG_Int, TAG_Long, TAG_Float, and TAG_Double, v is the tag's value.
+    For TAG_Byte_Array, TAG_Int_Array, and TAG_Long_Array, v is the array's length; the array's contents should be written afterwards.
+    """
+    h = _header( tagType, name )
+    #Write the header and payload in one go rather than separately.
+    o.write( h + _STRUCTS[ tagType ].pack( v ) )
 
 #_rb
 def readByte( i ):
@@ -316,10 +367,23 @@ def writeDouble( v, o ):
     """Writes a TAG_Double payload."""
     o.write( _D.pack( v ) )
 
+#_bl
+def byteLength( v ):
+    """
+    Returns the length of the given bytes-like object, v, in bytes.
+    For bytes-like objects whose items are larger than a byte (e.g. memoryviews of arrays), this differs from len( v ).
+    """
+    if isinstance( v, ( bytes, bytearray ) ):
+        return len( v )
+    return memoryview( v ).nbytes
+
 #_wba
 def writeByteArray( v, o ):
-    """Writes a TAG_Byte_Array payload."""
-    o.write( _I.pack( len( v ) ) )
+    """
+    Writes a TAG_Byte_Array payload.
+    v can be any bytes-like object; it is written directly, without being copied.
+    """
+    o.write( _I.pack( byteLength( v ) ) )
     o.write( v )
 
 #_rst
@@ -338,10 +402,9 @@ def writeString( v, o ):
     #Reraise struct.error as OutOfBoundsError if v is too large.
     #Note: len(v) cannot be negative here
     try:
-        o.write( _S.pack( length ) )
-    except struct.error as e:
+        o.write( _S.pack( length ) + v )
+    except _StructError as e:
         raise OutOfBoundsError( length, 0, 32768 ) from e
-    o.write( v )
 
 #_rlh
 def readTagListHeader( i ):
@@ -366,13 +429,44 @@ def writeTagListHeader( t, l, o ):
     """Writes a TAG_List header."""
     o.write( _TL.pack( t, l ) )
 
+#_wts
+def writeTags( t, v, o ):
+    """
+    Writes the payloads of the tags in a TAG_List (without the list's header).
+    t is the list's tagType, and v is a sequence of values of that type.
+    """
+    #Fixed-width payloads are packed into a single bytes object and written all at once.
+    fmt = _FORMATS[ t ]
+    if fmt is not None:
+        if isinstance( v, array ) and v.typecode == fmt:
+            #Arrays of the right type only need a copy and a byteswap; this is far cheaper than unpacking every value into a struct call.
+            a = array( fmt, v )
+            byteswapMaybe( a )
+            o.write( a )
+        else:
+            o.write( _pack( ">{:d}{}".format( len( v ), fmt ), *v ) )
+        return
+
+    w = _WRITERS[ t ]
+    if w is None:
+        #Nothing to write for empty lists (e.g. a TAG_List of TAG_End)
+        if len( v ) == 0:
+            return
+        raise NBTFormatError( "Cannot write {} values directly; they must be written one tag at a time.".format( describeTag( t ) ) )
+    for x in v:
+        w( x, o )
+
 #_wlp
 def writeTagList( t, v, o ):
     """Writes a TAG_List payload."""
+    #Lists of fixed-width tags are packed, header included, into a single bytes object and written all at once.
+    fmt = _FORMATS[ t ]
+    if fmt is not None and not ( isinstance( v, array ) and v.typecode == fmt ):
+        l = len( v )
+        o.write( _pack( ">b" + SIGNED_INT_TYPE + "{:d}{}".format( l, fmt ), t, l, *v ) )
+        return
     writeTagListHeader( t, len( v ), o )
-    w = _WRITERS[ t ]
-    for x in v:
-        w( x, o )
+    writeTags( t, v, o )
 
 #_wia
 def writeIntArray( v, o ):
@@ -446,6 +540,25 @@ _WRITERS = (
     writeLongArray  #TAG_Long_Array
 )
 
+#Struct format strings a buffer of native-endian signed integers can have (e.g. memoryviews of numpy int32 / int64 arrays).
+_NATIVE_SIGNED_FORMATS = frozenset( ( "i", "l", "q", "@i", "@l", "@q", "=i", "=l", "=q" ) )
+
+def _copyBuffer( typecode, size, a ):
+    """
+    If a is a C-contiguous buffer of native-endian, signed, size-byte integers, returns a copy of it as an array with the given typecode.
+    Otherwise, returns None.
+    This lets us copy buffers like numpy arrays in one go rather than converting them one value at a time.
+    """
+    try:
+        m = memoryview( a )
+    except TypeError:
+        return None
+    if m.itemsize != size or m.format not in _NATIVE_SIGNED_FORMATS or not m.c_contiguous:
+        return None
+    r = array( typecode )
+    r.frombytes( m.cast( "B" ) )
+    return r
+
 #Compile platform-dependent functions during loadtime to avoid runtime lookup costs.
 
 #We may use either "i" or "l" as an array datatype depending on the system.
@@ -492,7 +605,8 @@ def writeInts( a, o ):
     Writes signed, big-endian, 4-byte integers stored in the given array, a, to the given writable file-like object, o.
     \"\"\"
     {BYTESWAP}
-    a.tofile( o )
+    #Write the array's buffer directly; a.tofile( o ) would copy it into a series of temporary bytes objects first.
+    o.write( a )
 
 #_wls
 def writeLongs( a, o ):
@@ -500,7 +614,8 @@ def writeLongs( a, o ):
     Writes signed, big-endian, 8-byte integers stored in the given array, a, to the given writable file-like object, o.
     \"\"\"
     {BYTESWAP}
-    a.tofile( o )
+    #Write the array's buffer directly; a.tofile( o ) would copy it into a series of temporary bytes objects first.
+    o.write( a )
 
 #_cria
 def copyReturnIntArray( a ):
@@ -529,13 +644,18 @@ def convertCopyReturnIntArray( a ):
     If a is an array of signed 4-byte integers:
         ...and this is a big-endian system, returns the array.
         ...and this is a little-endian system, returns a copy of the array.
+    If a is some other buffer of native-endian signed 4-byte integers (e.g. a numpy array), returns a copy of it as an array.
     Otherwise, converts a to a signed 4-byte integer array and returns the array.
     \"\"\"
-    if isinstance( a, array ) and a.typecode == "{SIGNED_INT_TYPE}":
-        {COPY_INTS}
-        return a
-    else:
-        return array( "{SIGNED_INT_TYPE}", a )
+    if isinstance( a, array ):
+        if a.typecode == "{SIGNED_INT_TYPE}":
+            {COPY_INTS}
+            return a
+    elif not isinstance( a, ( list, tuple ) ):
+        r = _copyBuffer( "{SIGNED_INT_TYPE}", 4, a )
+        if r is not None:
+            return r
+    return array( "{SIGNED_INT_TYPE}", a )
 #_ccrla
 def convertCopyReturnLongArray( a ):
     \"\"\"
@@ -543,13 +663,18 @@ def convertCopyReturnLongArray( a ):
     If a is an array of signed 8-byte integers:
         ...and this is a big-endian system, returns the array.
         ...and this is a little-endian system, returns a copy of the array.
+    If a is some other buffer of native-endian signed 8-byte integers (e.g. a numpy array), returns a copy of it as an array.
     Otherwise, converts a to a signed 8-byte integer array and returns the array.
     \"\"\"
-    if isinstance( a, array ) and a.typecode == "q":
-        {COPY_LONGS}
-        return a
-    else:
-        return array( "q", a )
+    if isinstance( a, array ):
+        if a.typecode == "q":
+            {COPY_LONGS}
+            return a
+    elif not isinstance( a, ( list, tuple ) ):
+        r = _copyBuffer( "q", 8, a )
+        if r is not None:
+            return r
+    return array( "q", a )
 #_bm
 def byteswapMaybe( a ):
     \"\"\"
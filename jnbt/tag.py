@@ -3,11 +3,14 @@ JNBT's tag module provides a DOM-style interface for reading, writing, building,
 
 NBTDocument, several TAG_* classes and the read() function are implemented here.
 """
+import sys
 import gzip
 import zlib
 import itertools
 
+from struct import pack as _pack, unpack as _unpack, calcsize as _calcsize
 from collections import OrderedDict
+from collections.abc import Mapping, MutableMapping
 from array import array
 from io import BytesIO, StringIO
 
@@ -31,7 +34,9 @@ from jnbt.shared import (
 
     tagListString       as _tls,
     assertValidTagType  as _avtt, byteswapMaybe       as _bm,
-    copyReturnIntArray  as _cria, copyReturnLongArray as _crla
+    copyReturnIntArray  as _cria, copyReturnLongArray as _crla,
+
+    _FORMATS
 )
 
 #Base class methods called at various locations
@@ -55,7 +60,16 @@ _list_delitem   = list.__delitem__
 _list_iadd      = list.__iadd__
 _list_imul      = list.__imul__
 _list_repr      = list.__repr__
-_od_setitem     = OrderedDict.__setitem__
+#Since Python 3.7, dict is guaranteed to preserve insertion order, and is both faster and smaller than OrderedDict.
+#On older versions we fall back to OrderedDict so TAG_Compounds still remember the order their tags were added in.
+if sys.version_info >= ( 3, 7 ):
+    _CompoundBase = dict
+else:
+    _CompoundBase = OrderedDict
+_dict_new       = _CompoundBase.__new__
+_dict_setitem   = _CompoundBase.__setitem__
+_dict_update    = _CompoundBase.update
+_dict_repr      = dict.__repr__
 
 #Generator that converts values in the given iterable, i, to a deduced tag class if necessary.
 #The tag class is deduced by inspecting the first value of the iterable, f, in this order:
@@ -195,8 +209,8 @@ def _makeTagSetter( methodname, tagclass ):
             raise TypeError( "Attempted to set a non-str key on TAG_Compound." )
         t = tagclass( *args, **kwargs )
 
-        #Since we know what the tagtype is, avoid extra cost of calling TAG_Compound.__setitem__. Use base class OrderedDict.__setitem__ instead.
-        _od_setitem( self, name, t )
+        #Since we know what the tagtype is, avoid extra cost of calling TAG_Compound.__setitem__. Use the base class's __setitem__ instead.
+        _dict_setitem( self, name, t )
         return t
     #Override setter.__name__ so help( tagclass ) shows this as "methodname( self, name, value)" instead of "methodname = setter( self, name, value )"
     setter.__name__ = methodname
@@ -221,7 +235,7 @@ def _makeTagSetDefault( methodname, tagclass ):
             if not isinstance( name, str ):
                 raise TypeError( "Attempted to set a non-str key on TAG_Compound." )
             t = tagclass( *args, **kwargs )
-            _od_setitem( self, name, t )
+            _dict_setitem( self, name, t )
         elif t.tagType != tagclass.tagType:
             raise WrongTagError( tagclass.tagType, t.tagType );
         return t
@@ -262,6 +276,15 @@ def _makeIntPrimitiveClass( classname, tt, vmin, vmax, r, w, **kwargs ):
         """.format( classname )
     return _IntPrimitiveTag
 
+#Indentation strings used by _p(), indexed by depth.
+#Do _INDENTS[depth] to get the indentation for that depth; strings for depths we haven't seen yet are built on demand and cached.
+class _Indents( dict ):
+    __slots__ = ()
+    def __missing__( self, depth ):
+        indent = self[depth] = "    "*depth
+        return indent
+_INDENTS = _Indents()
+
 #rget() implementation for TAG_String, TAG_Byte_Array, TAG_Int_Array, and TAG_Long_Array.
 #If more than 1 positional argument is provided to this function, default is returned.
 #This is because these aforementioned tag types contain leaves (non-container values) and indexing a leaf is guaranteed to fail.
@@ -405,7 +428,7 @@ class _BaseIntTag( int, _BaseTag ):
     def __repr__( self ):
         return "{}({})".format( self.__class__.__name__, _int_repr( self ) )
     def _p( self, name, depth, maxdepth, maxlen, fn ):
-        fn( "{}{}{}: {:d}".format( "    "*depth, self.__class__.__name__, name, self ) )
+        fn( "{}{}{}: {:d}".format( _INDENTS[depth], self.__class__.__name__, name, self ) )
 
 TAG_Byte  = _makeIntPrimitiveClass( "TAG_Byte",  TAG_BYTE,                  -128,                 127, _rb, _wb, isByte  = True )
 TAG_Short = _makeIntPrimitiveClass( "TAG_Short", TAG_SHORT,               -32768,               32767, _rs, _ws, isShort = True )
@@ -430,7 +453,7 @@ class TAG_Float( float, _BaseTag ):
     def __repr__( self ):
         return "TAG_Float({})".format( _float_repr( self ) )
     def _p( self, name, depth, maxdepth, maxlen, fn ):
-        fn( "{}TAG_Float{}: {:.17g}".format( "    "*depth, name, self ) )
+        fn( "{}TAG_Float{}: {:.17g}".format( _INDENTS[depth], name, self ) )
     def _r( i ):
         return TAG_Float( _rf( i ) )
     _w = _wf
@@ -453,7 +476,7 @@ class TAG_Double( float, _BaseTag ):
     def __repr__( self ):
         return "TAG_Double({})".format( _float_repr( self ) )
     def _p( self, name, depth, maxdepth, maxlen, fn ):
-        fn( "{}TAG_Double{}: {:.17g}".format( "    "*depth, name, self ) )
+        fn( "{}TAG_Double{}: {:.17g}".format( _INDENTS[depth], name, self ) )
     def _r( i ):
         return TAG_Double( _rd( i ) )
     _w = _wd
@@ -481,7 +504,7 @@ class TAG_Byte_Array( bytearray, _BaseTag ):
     rget = _rget_leaf
     def _p( self, name, depth, maxdepth, maxlen, fn ):
         l = len( self )
-        fn( "{}TAG_Byte_Array{}: [{:d} byte{}]".format( "    "*depth, name, l, "s" if l != 1 else "" ) )
+        fn( "{}TAG_Byte_Array{}: [{:d} byte{}]".format( _INDENTS[depth], name, l, "s" if l != 1 else "" ) )
     def _r( i ):
         l = _rah( i )
         return TAG_Byte_Array( _r( i, l ) )
@@ -524,7 +547,7 @@ class TAG_String( str, _BaseTag ):
     rget = _rget_leaf
 
     def _p( self, name, depth, maxdepth, maxlen, fn ):
-        fn( "{}TAG_String{}: {:s}".format( "    "*depth, name, self ) )
+        fn( "{}TAG_String{}: {:s}".format( _INDENTS[depth], name, self ) )
     def _r( i ):
         return TAG_String( _rst( i ) )
     _w = _wst
@@ -557,7 +580,7 @@ class TAG_Int_Array( array, _BaseTag ):
 
     def _p( self, name, depth, maxdepth, maxlen, fn ):
         l = len( self )
-        fn( "{}TAG_Int_Array{}: [{:d} int{}]".format( "    "*depth, name, l, "s" if l != 1 else "" ) )
+        fn( "{}TAG_Int_Array{}: [{:d} int{}]".format( _INDENTS[depth], name, l, "s" if l != 1 else "" ) )
     def _r( i ):
         tag = TAG_Int_Array()
         l = _rah( i )
@@ -596,7 +619,7 @@ class TAG_Long_Array( array, _BaseTag ):
 
     def _p( self, name, depth, maxdepth, maxlen, fn ):
         l = len( self )
-        fn( "{}TAG_Long_Array{}: [{:d} long{}]".format( "    "*depth, name, l, "s" if l != 1 else "" ) )
+        fn( "{}TAG_Long_Array{}: [{:d} long{}]".format( _INDENTS[depth], name, l, "s" if l != 1 else "" ) )
     def _r( i ):
         tag = TAG_Long_Array()
         l = _rah( i )
@@ -725,9 +748,27 @@ class TAG_List( list, _BaseTag ):
             If all of these attempts fail, a ConversionError is raised.
         If a conversion is performed, the tag constructor may raise an exception.
         """
-        ml = len( self )
+        #Replace a single tag, e.g. list[1] = TAG_Int( 5 ). This is by far the most common case, so it's checked first.
+        if isinstance( key, int ):
+            ltt = self.listTagType
+            t = getattr( value, "tagType", None )
+            #value is a non-tag or a tag of a different type (and the list isn't empty; if it is, let list.__setitem__ throw an IndexError)
+            if t != ltt and ltt != TAG_END:
+                #Out-of-range keys raise IndexError before any conversion is attempted
+                l = len( self )
+                if key >= l or key < -l:
+                    raise IndexError( "list assignment index out of range" )
+                #If we're replacing our only tag with another tag, change the list tagType.
+                if t is not None and l == 1:
+                    _list_setitem( self, key, value )
+                    self.listTagType = t
+                    return
+                #Otherwise the replacement tag needs to match the tagType of the rest of the tags.
+                value = _TAGCLASS[ ltt ]( value )
+            _list_setitem( self, key, value )
         #Add, remove, or replace tags in a slice, e.g. list[1:4] = (1,2,3)
-        if isinstance( key, slice ):
+        elif isinstance( key, slice ):
+            ml = len( self )
             sl = len( range( *key.indices( ml ) ) )
 
             #Replace the entire list's contents. This may possibly change the list tagType.
@@ -737,23 +778,6 @@ class TAG_List( list, _BaseTag ):
             #Replace some of the list's contents, values must be converted to existing tagType if different
             else:
                 _list_setitem( self, key, _TL_v2t( value, _TAGCLASS[ self.listTagType ] ) )
-        #Replace a single tag...
-        elif isinstance( key, int ):
-            #Replace an existing tag with another tag, e.g. list[1] = TAG_Int( 5 )
-            #Change the list tagType if we're replacing our only tag.
-            if ml == 1:
-                t = getattr( value, "tagType", None )
-                if t is None:
-                    value = _TAGCLASS[self.listTagType]( value )
-                else:
-                    self.listTagType = t
-            #If we have several tags, the replacement tag needs to match the tagType of the rest of the tags.
-            #Attempt a conversion if value is a tag of a different type or a non-tag.
-            elif ml > 0:
-                ltt = self.listTagType
-                if getattr( value, "tagType", None ) != ltt:
-                    value = _TAGCLASS[ ltt ]( value )
-            _list_setitem( self, key, value )
         #Invalid key, let list.__setitem__ throw a TypeError
         else:
             _list_setitem( self, key, None )
@@ -779,9 +803,10 @@ class TAG_List( list, _BaseTag ):
         self.listTagType = TAG_END
 
     def copy( self ):
+        #Our values are already tags, so skip TAG_List.__init__ and its conversions and copy them straight over.
         l = _list_new( TAG_List )
+        _list_init( l, self )
         l.listTagType = self.listTagType
-        super( TAG_List, l ).__iadd__( self )
         return l
 
     def extend( self, iterable ):
@@ -840,7 +865,7 @@ class TAG_List( list, _BaseTag ):
 
     def _p( self, name, depth, maxdepth, maxlen, fn ):
         l = len( self )
-        indent = "    "*depth
+        indent = _INDENTS[depth]
         line = "{}TAG_List{}: {} [".format( indent, name, _tls( l, self.listTagType ) )
 
         if l == 0:
@@ -866,29 +891,60 @@ class TAG_List( list, _BaseTag ):
 
     def _r( i ):
         t, l = _rlh( i )
-        c = _TAGCLASS[ t ]
 
-        tag = TAG_List()
+        #Note: Tags read from a file are allocated with the base class's __new__, skipping the constructor (and its argument handling / conversion) entirely.
+        tag = _list_new( TAG_List )
         tag.listTagType = t
+        if l == 0:
+            return tag
+
+        #Fixed-width payloads are read and unpacked all at once.
+        fmt = _FORMATS[ t ]
+        if fmt is not None:
+            fmt = ">{:d}{}".format( l, fmt )
+            _list_init( tag, map( _TAGCLASS[ t ], _unpack( fmt, _r( i, _calcsize( fmt ) ) ) ) )
+            return tag
+
+        #Bind the reader and append method to locals so the loop below doesn't repeat these lookups per element.
+        r = _READERS[ t ]
         a = super( TAG_List, tag ).append
 
         for _ in range( l ):
-            a( c._r( i ) )
+            a( r( i ) )
 
         return tag
 
     def _w( self, o ):
-        _wlh( self.listTagType, len( self ), o )
+        ltt = self.listTagType
+        _wlh( ltt, len( self ), o )
+        if ltt == TAG_END:
+            return
+
+        #Fixed-width payloads are packed into a single bytes object and written all at once.
+        fmt = _FORMATS[ ltt ]
+        if fmt is not None:
+            o.write( _pack( ">{:d}{}".format( len( self ), fmt ), *self ) )
+            return
+
+        #Every tag in the list shares the same class, so look up its writer once rather than once per tag.
+        w = _TAGCLASS[ ltt ]._w
         for t in self:
-            t._w( o )
+            w( t, o )
 
 
-class TAG_Compound( OrderedDict, _BaseTag ):
+class TAG_Compound( _CompoundBase, _BaseTag ):
     """
     Represents a TAG_Compound.
-    TAG_Compound is an OrderedDict subclass and generally works the same way and in the same places any other mapping (dict, etc.) would, with one major exception:
+    TAG_Compound is a dict subclass (OrderedDict prior to Python 3.7) and generally works the same way and in the same places any other mapping (dict, etc.) would, with one major exception:
     The keys and values of a TAG_Compound are restricted to str and TAG_* objects (e.g. TAG_Byte, TAG_Compound, etc) respectively.
 
+    TAG_Compound remembers the order its tags were added in, and provides OrderedDict's move_to_end() and popitem( last=True ) on every Python version.
+    Since Python 3.7, TAG_Compound is based on dict rather than OrderedDict. Compared to earlier versions of jnbt, this means:
+        * isinstance( tag, OrderedDict ) is False.
+        * Comparing two TAG_Compounds with == ignores the order of their tags, like comparing two dicts does.
+        * TAG_Compounds (and NBTDocuments) have no __dict__, so arbitrary attributes cannot be assigned to them.
+        * repr() shows tags in dict form, e.g. TAG_Compound({'a': TAG_Int(1)}), rather than as a list of pairs.
+
     A TAG_Compound can be initialized in the same ways a normal dict / OrderedDict can:
         * TAG_Compound( { k: v, ... } ):  From another mapping (e.g. dict, OrderedDict, etc).
         * TAG_Compound( [ (k,v), ... ] ): With an iterable of pairs (where pair = an iterable containing a key and value, in that order)
@@ -900,6 +956,61 @@ class TAG_Compound( OrderedDict, _BaseTag ):
 
     __slots__ = ()
 
+    def __init__( self, *args, **kwargs ):
+        #Note: dict.__init__ doesn't go through __setitem__, so values wouldn't be converted to tags. Use update() instead.
+        self.update( *args, **kwargs )
+
+    #Like __init__, dict's versions of these bypass __setitem__; MutableMapping's implementations call it for every value.
+    update     = MutableMapping.update
+    setdefault = MutableMapping.setdefault
+
+    #OrderedDict provides these already; on Python 3.7+, implement them on top of dict's insertion ordering.
+    if _CompoundBase is dict:
+        def move_to_end( self, key, last=True ):
+            """
+            Move an existing tag to either end of the TAG_Compound.
+            Moves it to the end if last is True (the default), or to the beginning if last is False.
+            Raises KeyError if key is not in the TAG_Compound.
+            """
+            value = dict.pop( self, key )
+            if last:
+                _dict_setitem( self, key, value )
+            else:
+                items = list( dict.items( self ) )
+                dict.clear( self )
+                _dict_setitem( self, key, value )
+                _dict_update( self, items )
+
+        def popitem( self, last=True ):
+            """
+            Remove and return a ( key, value ) pair from the TAG_Compound.
+            Pairs are returned in LIFO order if last is True (the default), or FIFO order if last is False.
+            Raises KeyError if the TAG_Compound is empty.
+            """
+            if last:
+                return dict.popitem( self )
+            for key in self:
+                return key, dict.pop( self, key )
+            raise KeyError( "popitem(): TAG_Compound is empty" )
+
+    def __ior__( self, other ):
+        self.update( other )
+        return self
+
+    def __or__( self, other ):
+        if not isinstance( other, Mapping ):
+            return NotImplemented
+        tag = self.copy()
+        tag.update( other )
+        return tag
+
+    def __ror__( self, other ):
+        if not isinstance( other, Mapping ):
+            return NotImplemented
+        tag = TAG_Compound( other )
+        tag.update( self )
+        return tag
+
     def __setitem__( self, key, value ):
         """
         Handle self[key] = value.
@@ -941,9 +1052,13 @@ class TAG_Compound( OrderedDict, _BaseTag ):
             else:
                 value = temp.__class__( value )
 
-        _od_setitem( self, key, value )
+        _dict_setitem( self, key, value )
 
-    #Note: No __repr__ override necessary, OrderedDict inserts the correct classname for us
+    def __repr__( self ):
+        if len( self ) > 0:
+            return "TAG_Compound({})".format( _dict_repr( self ) )
+        else:
+            return "TAG_Compound()"
 
     byte      = _makeTagSetter( "byte",      TAG_Byte       )
     short     = _makeTagSetter( "short",     TAG_Short      )
@@ -972,7 +1087,10 @@ class TAG_Compound( OrderedDict, _BaseTag ):
     setdefault_longarray = _makeTagSetDefault( "setdefault_longarray", TAG_Long_Array )
 
     def copy( self ):
-        return TAG_Compound( self )
+        #Our values are already tags, so skip the conversion done by TAG_Compound( self ) and copy them straight over.
+        tag = _dict_new( TAG_Compound )
+        _dict_update( tag, self )
+        return tag
 
     def rget( self, *args, default=None ):
         l = len( args )
@@ -988,8 +1106,8 @@ class TAG_Compound( OrderedDict, _BaseTag ):
 
     def _p( self, name, depth, maxdepth, maxlen, fn ):
         l = len( self )
-        indent = "    "*depth
-        line = "{}TAG_Compound{}: {} {{".format( indent, name, "{:d} entr{}".format( l, "ies" if l != 1 else "y" ) )
+        indent = _INDENTS[depth]
+        line = "{}TAG_Compound{}: {:d} entr{} {{".format( indent, name, l, "ies" if l != 1 else "y" )
         if l == 0:
             fn( line + "}" )
         elif depth < maxdepth and maxlen != 0:
@@ -1007,30 +1125,73 @@ class TAG_Compound( OrderedDict, _BaseTag ):
             fn( line + " ... }" )
 
     def _r( i ):
-        tag = TAG_Compound()
-        si = super( TAG_Compound, tag ).__setitem__
-
-        tt = _rb( i )
-        while tt != TAG_END:
-            #Check that the tagType is valid.
-            _avtt( tt )
-
-            #Now that we know the tag isn't TAG_END, read the name and check that there isn't already a tag with that name
-            name = _rst( i )
-            if name in tag:
-                raise DuplicateNameError( name )
-
-            si( name, _TAGCLASS[tt]._r( i ) )
-            tt = _rb( i )
-
-        return tag
+        return _readCompound( _dict_new( TAG_Compound ), i )
 
     def _w( self, o ):
+        wtn = _wtn
         for n,t in self.items():
-            _wtn( t.tagType, n, o )
+            wtn( t.tagType, n, o )
             t._w( o )
         o.write( b"\0" )
 
+#Reads the payload of a TAG_Compound from the given file-like object, i, into the given (empty) compound, tag, and returns it.
+#Shared by TAG_Compound._r and NBTDocument._r so the latter can read directly into an NBTDocument.
+def _readCompound( tag, i ):
+    si = _dict_setitem
+    readers = _READERS
+
+    tt = _rb( i )
+    while tt != TAG_END:
+        #Check that the tagType is valid.
+        _avtt( tt )
+
+        #Now that we know the tag isn't TAG_END, read the name and check that there isn't already a tag with that name
+        name = _rst( i )
+        if name in tag:
+            raise DuplicateNameError( name )
+
+        si( tag, name, readers[tt]( i ) )
+        tt = _rb( i )
+
+    return tag
+
+#Functions that read (and if necessary, decompress) the entire file at the given path, keyed by compression type.
+#Each returns a BytesIO containing the file's uncompressed NBT data.
+#Note: Reading the whole file up front is much faster than parsing directly from the file (or worse, a GzipFile),
+#since the parser makes several small reads per tag and each of those reads from a BytesIO is far cheaper.
+def _readFile( path ):
+    with open( path, "rb" ) as file:
+        return BytesIO( file.read() )
+def _readGzip( path ):
+    with open( path, "rb" ) as file:
+        return BytesIO( gzip.decompress( file.read() ) )
+def _readZlib( path ):
+    with open( path, "rb" ) as file:
+        return BytesIO( zlib.decompress( file.read() ) )
+
+_OPENERS = {
+    None:   _readFile,
+    "gzip": _readGzip,
+    "zlib": _readZlib
+}
+
+#Functions that write the given (uncompressed) NBT data to the file at the given path, keyed by compression type.
+def _writeFile( path, data ):
+    with open( path, "wb" ) as file:
+        file.write( data )
+def _writeGzip( path, data ):
+    with gzip.open( path, "wb" ) as file:
+        file.write( data )
+def _writeZlib( path, data ):
+    with open( path, "wb" ) as file:
+        file.write( zlib.compress( data ) )
+
+_FILEWRITERS = {
+    None:   _writeFile,
+    "gzip": _writeGzip,
+    "zlib": _writeZlib
+}
+
 class NBTDocument( TAG_Compound ):
     """
     Represents an NBT document.
@@ -1038,7 +1199,7 @@ class NBTDocument( TAG_Compound ):
     An NBTDocument is a named TAG_Compound that serves as the root tag of the NBT tree.
     Although NBTDocuments can be named, more often than not the name is simply the empty string, "".
     """
-    __slots__ = ()
+    __slots__ = ( "name", "target", "compression" )
 
     def __init__( self, *args, **kwargs ):
         """
@@ -1097,26 +1258,26 @@ class NBTDocument( TAG_Compound ):
         Implementation of NBTDocument#write() that takes a fixed number of parameters.
         See help( NBTDocument.write ) for further documentation.
         """
-        is_zlib = False
         if isinstance( target, str ):
-            if compression is None:
-                file = open( target, "wb" )
-            elif compression == "gzip":
-                file = gzip.open( target, "wb" )
-            #For zlib compressed files we write raw NBT to a BytesIO, then later zlib compress this data to the target file.
-            elif compression == "zlib":
-                file = BytesIO()
-                is_zlib = True
-            else:
+            fw = _FILEWRITERS.get( compression )
+            if fw is None:
                 raise ValueError( "Unknown compression type \"{}\".".format( compression ) )
 
-            with file:
-                self._w( file )
-                if is_zlib:
-                    with open( target, "wb" ) as hardfile:
-                        hardfile.write( zlib.compress( file.getbuffer() ) )
-        else:
+            #Serialize the document to memory first, then write it to the file all at once.
+            #Writing many small pieces is slow, especially when each one has to pass through a compressor.
+            #This also means that if serialization fails, the target file is left untouched.
+            with BytesIO() as buffer:
+                self._w( buffer )
+                with buffer.getbuffer() as data:
+                    fw( target, data )
+        #BytesIO targets are already in memory, so there's nothing to gain by buffering them.
+        elif isinstance( target, BytesIO ):
             self._w( target )
+        else:
+            with BytesIO() as buffer:
+                self._w( buffer )
+                with buffer.getbuffer() as data:
+                    target.write( data )
 
     def write( self, *args, **kwargs ):
         """
@@ -1140,11 +1301,7 @@ class NBTDocument( TAG_Compound ):
             return self._writeImpl( *args, **kwargs )
 
     def _r( i ):
-        name = _retn( i, TAG_COMPOUND )
-        tag = TAG_Compound._r( i )
-        tag.name = name
-        tag.__class__ = NBTDocument
-        return tag
+        return _readCompound( NBTDocument( _retn( i, TAG_COMPOUND ) ), i )
 
     def _w( self, o ):
         _wtn( TAG_COMPOUND, self.name, o )
@@ -1152,7 +1309,7 @@ class NBTDocument( TAG_Compound ):
 
     def __repr__( self ):
         parts = []
-        name, other = self.name, super().__repr__()[12:-1]
+        name, other = self.name, _dict_repr( self ) if len( self ) > 0 else ""
         if len( name ) > 0:
             parts.append( "'{}'".format( name ) )
         if len( other ) > 0:
@@ -1185,6 +1342,10 @@ _TAGCLASS = (
     TAG_Long_Array  #TAG_LONG_ARRAY
 )
 
+#Tuple of tag readers indexed by tagType.
+#Do _READERS[tagType]( i ) to read the payload of a tag with that tagType; equivalent to _TAGCLASS[tagType]._r( i ) minus the attribute lookup.
+_READERS = tuple( None if c is None else c._r for c in _TAGCLASS )
+
 #A function that takes a Python array and (depending on the array's typecode) returns a copy of it as a new TAG_Int_Array or TAG_Long_Array.
 #In the _TAGMAP dict below, we map Python arrays to this function instead of a singular tag class because there are multiple possible tag classes
 #and some logic is needed to deduce the appropriate one.
@@ -1237,17 +1398,11 @@ def read( source, compression="gzip", target=None, create=False ):
     if isinstance( source, str ):
         if target is None:
             target = source
+        opener = _OPENERS.get( compression )
+        if opener is None:
+            raise ValueError( "Unknown compression type \"{}\".".format( compression ) )
         try:
-            if compression is None:
-                file = open( source, "rb" )
-            elif compression == "gzip":
-                file = gzip.open( source, "rb" )
-            elif compression == "zlib":
-                with open( source, "rb" ) as hardfile:
-                    file = BytesIO( zlib.decompress( hardfile.read() ) )
-            else:
-                raise ValueError( "Unknown compression type \"{}\".".format( compression ) )
-            with file:
+            with opener( source ) as file:
                 doc = NBTDocument._r( file )
         except FileNotFoundError:
             if create is True:
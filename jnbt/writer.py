@@ -2,20 +2,20 @@ import gzip
 import zlib
 
 from collections import deque
-from io          import BytesIO
-from types       import MethodType
+from io          import BufferedWriter, RawIOBase
 
 from jnbt.shared import (
     NBTFormatError, describeTag,
-    WrongTagError, DuplicateNameError,
+    WrongTagError, DuplicateNameError, OutOfBoundsError,
     TAG_END, TAG_BYTE, TAG_SHORT, TAG_INT, TAG_LONG, TAG_FLOAT, TAG_DOUBLE, TAG_BYTE_ARRAY, TAG_STRING, TAG_LIST, TAG_COMPOUND, TAG_INT_ARRAY, TAG_LONG_ARRAY,
     TAG_COUNT,
 
     writeTagName       as _wtn, writeByte      as _wb,  writeShort    as _ws,
     writeInt           as _wi,  writeLong      as _wl,  writeFloat    as _wf,
     writeDouble        as _wd,  writeByteArray as _wba, writeString   as _wst,
-    writeTagListHeader as _wlh, writeTagList   as _wlp, writeIntArray as _wia,
-    writeInts          as _wis, writeLongArray as _wla, writeLongs    as _wls,
+    writeTagListHeader as _wlh, writeTagList   as _wlp, writeTags     as _wts,
+    writeIntArray      as _wia, writeLongArray as _wla, writeInts     as _wis,
+    writeLongs         as _wls, writeNamedValue as _wnv, byteLength    as _bl,
 
     convertCopyReturnIntArray as _ccria,  convertCopyReturnLongArray as _ccrla,
     assertValidTagType as _avtt,
@@ -30,32 +30,51 @@ def writer( target, compression="gzip" ):
         If target is a writable file-like object, this parameter is ignored; bytes will be written to the file as if compression were None.
     """
     if isinstance( target, str ):
-        close = None
         if compression is None:
             file = open( target, "wb" )
+        #GzipFile does a lot of work on every call to write() (CRC and compressor updates, size bookkeeping), and NBTWriter makes many small writes.
+        #Buffering them means the GzipFile only sees a handful of large writes instead.
         elif compression == "gzip":
-            file = gzip.open( target, "wb" )
-        #For zlib compressed files we write raw NBT to a BytesIO, then later zlib compress this data to the target file.
+            file = BufferedWriter( gzip.open( target, "wb" ), 65536 )
+        #zlib compressed files are compressed as they're written, so we never have to hold the entire uncompressed file in memory.
+        #This is buffered for the same reason as gzip above.
         elif compression == "zlib":
-            file = BytesIO()
-            def _close_finalize_zlib( self ):
-                with file, open( target, "wb" ) as hardfile:
-                    hardfile.write( zlib.compress( file.getbuffer() ) )
-            close = _close_finalize_zlib
+            file = BufferedWriter( _ZlibFile( target ), 65536 )
         else:
             raise ValueError( "Unknown compression type \"{}\".".format( compression ) )
         w = NBTWriter( file )
-        if close is not None:
-            w.close = MethodType( close, w )
     else:
         w = NBTWriter( target )
     return w
 
+class _ZlibFile( RawIOBase ):
+    """
+    A writable file-like object that zlib compresses the data written to it and writes the result to the file at the given path.
+    Closing it writes the remainder of the compressed data and closes the file.
+    """
+    def __init__( self, path ):
+        self._f = open( path, "wb" )
+        self._c = zlib.compressobj()
+    def writable( self ):
+        return True
+    def write( self, b ):
+        self._f.write( self._c.compress( b ) )
+        return len( b )
+    def close( self ):
+        if not self.closed:
+            try:
+                self._f.write( self._c.flush() )
+            finally:
+                self._f.close()
+                super().close()
+
 class _NBTWriterBase:
     """
     Base class for all other NBTWriter states.
     Implements a context stack and default NBTWriter methods.
     """
+    #Every state shares the same slots so that switching states by assigning to __class__ is possible.
+    __slots__ = ( "_o", "_s", "_r", "_a", "_b", "_c" )
     def __init__( self, output ):
         """
         Constructor for NBTWriter.
@@ -200,6 +219,7 @@ class _NBTWriterBase:
     def bytes( self, *args, **kwargs ):
         """
         Write the bytes-like object values to the current TAG_Byte_Array.
+        values is written directly, without being copied, so any object supporting the buffer protocol (e.g. a memoryview of a larger buffer) can be written efficiently.
 
         This method may only be called between calls to the .startByteArray() and .endByteArray() methods.
         """
@@ -273,6 +293,23 @@ class _NBTWriterBase:
         This method may only be called in tandem with a prior call to .startList().
         """
         raise NBTFormatError( "Attempted to end a TAG_List, but the current tag is not a TAG_List." )
+    def extend( self, *args, **kwargs ):
+        """
+        Write several tags to the current TAG_List at once.
+
+        tagType is expected to be the list's tagType.
+        All values in values are expected to be the python type corresponding to tagType (e.g. if tagType is jnbt.TAG_FLOAT, we expect each value to be a float).
+        tagType cannot be jnbt.TAG_LIST or jnbt.TAG_COMPOUND; see help( jnbt.NBTWriter.list ) for why.
+        For lists of numbers (TAG_Byte, TAG_Short, TAG_Int, TAG_Long, TAG_Float, and TAG_Double), this is much faster than writing each tag individually,
+        because every value is packed and written in a single call.
+
+        This method may only be called between calls to the .startList() and .endList() methods.
+        Example:
+            writer.startList( "pos", jnbt.TAG_DOUBLE, 3 )
+            writer.extend( jnbt.TAG_DOUBLE, ( 10.5, 64.0, -3.5 ) )
+            writer.endList()
+        """
+        raise NBTFormatError( "Attempted to write tags to a TAG_List, but the current tag is not a TAG_List." )
 
     def startCompound( self, *args, **kwargs ):
         """
@@ -368,11 +405,22 @@ class _NBTWriterBase:
         """
         raise NBTFormatError( "Attempted to end a TAG_Long_Array, but the current tag is not a TAG_Long_Array." )
 
+    def raw( self, *args, **kwargs ):
+        """
+        Write a tag of the given tagType whose payload has already been serialized.
+
+        payload is expected to be a bytes-like object containing the tag's payload exactly as it would appear in an NBT file (i.e. without the tag's type or name).
+        It is written verbatim; it is not checked in any way, so writing a malformed payload will produce a malformed file.
+        This is much faster than writing the tag piece by piece if you already have its serialized form (e.g. a large subtree copied from another file).
+        """
+        raise NBTFormatError( "A tag cannot be created here." )
+
 class _NBTWriterCompound( _NBTWriterBase ):
     """
     Context while writing a (non-root) TAG_Compound.
     Methods in this class take a name as a first argument.
     """
+    __slots__ = ()
     def _ac( self, name ):
         """
         Asserts that a tag with this name has not already been written.
@@ -385,47 +433,33 @@ class _NBTWriterCompound( _NBTWriterBase ):
         c.add( name )
     def byte( self, name, value ):
         self._ac( name )
-        o = self._o
-        _wtn( TAG_BYTE, name, o )
-        _wb( value, o )
+        _wnv( TAG_BYTE, name, value, self._o )
     def short( self, name, value ):
         self._ac( name )
-        o = self._o
-        _wtn( TAG_SHORT, name, o )
-        _ws( value, o )
+        _wnv( TAG_SHORT, name, value, self._o )
     def int( self, name, value ):
         self._ac( name )
-        o = self._o
-        _wtn( TAG_INT, name, o )
-        _wi( value, o )
+        _wnv( TAG_INT, name, value, self._o )
     def long( self, name, value ):
         self._ac( name )
-        o = self._o
-        _wtn( TAG_LONG, name, o )
-        _wl( value, o )
+        _wnv( TAG_LONG, name, value, self._o )
     def float( self, name, value ):
         self._ac( name )
-        o = self._o
-        _wtn( TAG_FLOAT, name, o )
-        _wf( value, o )
+        _wnv( TAG_FLOAT, name, value, self._o )
     def double( self, name, value ):
         self._ac( name )
-        o = self._o
-        _wtn( TAG_DOUBLE, name, o )
-        _wd( value, o )
+        _wnv( TAG_DOUBLE, name, value, self._o )
 
     def bytearray( self, name, values ):
         self._ac( name )
         o = self._o
-        _wtn( TAG_BYTE_ARRAY, name, o )
-        _wba( values, o )
+        _wnv( TAG_BYTE_ARRAY, name, _bl( values ), o )
+        o.write( values )
     def startByteArray( self, name, length ):
         if length < 0 or length > 2147483647:
             raise OutOfBoundsError( length, 0, 2147483647 )
         self._ac( name )
-        o = self._o
-        _wtn( TAG_BYTE_ARRAY, name, o )
-        _wi( length, o )
+        _wnv( TAG_BYTE_ARRAY, name, length, self._o )
         self._pushBA( length )
 
     def string( self, name, value ):
@@ -463,39 +497,43 @@ class _NBTWriterCompound( _NBTWriterBase ):
         self._ac( name )
         values = _ccria( values )
         o = self._o
-        _wtn( TAG_INT_ARRAY, name, o )
-        _wia( values, o )
+        _wnv( TAG_INT_ARRAY, name, len( values ), o )
+        _wis( values, o )
 
     def startIntArray( self, name, length ):
         if length < 0 or length > 2147483647:
             raise OutOfBoundsError( length, 0, 2147483647 )
         self._ac( name )
-        o = self._o
-        _wtn( TAG_INT_ARRAY, name, o )
-        _wi( length, o )
+        _wnv( TAG_INT_ARRAY, name, length, self._o )
         self._pushIA( length )
 
     def longarray( self, name, values ):
         self._ac( name )
         values = _ccrla( values )
         o = self._o
-        _wtn( TAG_LONG_ARRAY, name, o )
-        _wla( values, o )
+        _wnv( TAG_LONG_ARRAY, name, len( values ), o )
+        _wls( values, o )
 
     def startLongArray( self, name, length ):
         if length < 0 or length > 2147483647:
             raise OutOfBoundsError( length, 0, 2147483647 )
         self._ac( name )
-        o = self._o
-        _wtn( TAG_LONG_ARRAY, name, o )
-        _wi( length, o )
+        _wnv( TAG_LONG_ARRAY, name, length, self._o )
         self._pushLA( length )
 
+    def raw( self, name, tagType, payload ):
+        _avtt( tagType )
+        self._ac( name )
+        o = self._o
+        _wtn( tagType, name, o )
+        o.write( payload )
+
 class _NBTWriterList( _NBTWriterBase ):
     """
     Context while writing a TAG_List.
     Methods in this class do not take names as arguments.
     """
+    __slots__ = ()
     def _al( self, tagType ):
         """
         Asserts that the tagType of the element matches the list's tagType.
@@ -547,6 +585,17 @@ class _NBTWriterList( _NBTWriterBase ):
         self._al( TAG_LIST )
         _wlp( tagType, values, self._o )
 
+    def extend( self, tagType, values ):
+        c = self._c
+        if tagType != c:
+            raise WrongTagError( c, tagType )
+        a = self._a + len( values )
+        b = self._b
+        if a > b:
+            raise NBTFormatError( "More than {:d} tags were written.".format( b ) )
+        _wts( tagType, values, self._o )
+        self._a = a
+
     def startList( self, tagType, length ):
         if length < 0 or length > 2147483647:
             raise OutOfBoundsError( length, 0, 2147483647 )
@@ -587,10 +636,15 @@ class _NBTWriterList( _NBTWriterBase ):
         _wi( length, self._o )
         self._pushLA( length )
 
+    def raw( self, tagType, payload ):
+        self._al( tagType )
+        self._o.write( payload )
+
 class _NBTWriterByteArray( _NBTWriterBase ):
     """Context while writing a TAG_Byte_Array."""
+    __slots__ = ()
     def bytes( self, values ):
-        a = self._a + len( values )
+        a = self._a + _bl( values )
         b = self._b
         if a > b:
             raise NBTFormatError( "More than {:d} bytes were written.".format( b ) )
@@ -605,6 +659,7 @@ class _NBTWriterByteArray( _NBTWriterBase ):
 
 class _NBTWriterIntArray( _NBTWriterBase ):
     """Context while writing a TAG_Int_Array."""
+    __slots__ = ()
     def ints( self, values ):
         a = self._a + len( values )
         b = self._b
@@ -622,6 +677,7 @@ class _NBTWriterIntArray( _NBTWriterBase ):
 
 class _NBTWriterLongArray( _NBTWriterBase ):
     """Context while writing a TAG_Long_Array."""
+    __slots__ = ()
     def longs( self, values ):
         a = self._a + len( values )
         b = self._b
@@ -639,6 +695,7 @@ class _NBTWriterLongArray( _NBTWriterBase ):
 
 class _NBTWriterRootCompound( _NBTWriterCompound ):
     """Context while writing the root TAG_Compound."""
+    __slots__ = ()
     def end( self ):
         self._o.write( b"\0" )
         self.__class__ = NBTWriter
@@ -669,6 +726,7 @@ class NBTWriter( _NBTWriterBase ):
 
             writer.end()
     """
+    __slots__ = ()
     def start( self, name="" ):
         if self._r is True:
             raise NBTFormatError( "The root TAG_Compound has already been created." )
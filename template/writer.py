@@ -2,13 +2,12 @@ import gzip
 import zlib
 
 from collections import deque
-from io          import BytesIO
-from types       import MethodType
+from io          import BufferedWriter, RawIOBase
 
 from jnbt.shared import (
     NBTFormatError, describeTag,
     #if safe
-    WrongTagError, DuplicateNameError,
+    WrongTagError, DuplicateNameError, OutOfBoundsError,
     #end
     TAG_END, TAG_BYTE, TAG_SHORT, TAG_INT, TAG_LONG, TAG_FLOAT, TAG_DOUBLE, TAG_BYTE_ARRAY, TAG_STRING, TAG_LIST, TAG_COMPOUND, TAG_INT_ARRAY, TAG_LONG_ARRAY,
     TAG_COUNT,
@@ -16,8 +15,9 @@ from jnbt.shared import (
     writeTagName       as _wtn, writeByte      as _wb,  writeShort    as _ws,
     writeInt           as _wi,  writeLong      as _wl,  writeFloat    as _wf,
     writeDouble        as _wd,  writeByteArray as _wba, writeString   as _wst,
-    writeTagListHeader as _wlh, writeTagList   as _wlp, writeIntArray as _wia,
-    writeInts          as _wis, writeLongArray as _wla, writeLongs    as _wls,
+    writeTagListHeader as _wlh, writeTagList   as _wlp, writeTags     as _wts,
+    writeIntArray      as _wia, writeLongArray as _wla, writeInts     as _wis,
+    writeLongs         as _wls, writeNamedValue as _wnv, byteLength    as _bl,
 
     convertCopyReturnIntArray as _ccria,  convertCopyReturnLongArray as _ccrla,
     #if safe
@@ -34,32 +34,55 @@ def writer( target, compression="gzip" ):
         If target is a writable file-like object, this parameter is ignored; bytes will be written to the file as if compression were None.
     """
     if isinstance( target, str ):
-        close = None
         if compression is None:
             file = open( target, "wb" )
+        #GzipFile does a lot of work on every call to write() (CRC and compressor updates, size bookkeeping), and NBTWriter makes many small writes.
+        #Buffering them means the GzipFile only sees a handful of large writes instead.
         elif compression == "gzip":
-            file = gzip.open( target, "wb" )
-        #For zlib compressed files we write raw NBT to a BytesIO, then later zlib compress this data to the target file.
+            file = BufferedWriter( gzip.open( target, "wb" ), 65536 )
+        #zlib compressed files are compressed as they're written, so we never have to hold the entire uncompressed file in memory.
+        #This is buffered for the same reason as gzip above.
         elif compression == "zlib":
-            file = BytesIO()
-            def _close_finalize_zlib( self ):
-                with file, open( target, "wb" ) as hardfile:
-                    hardfile.write( zlib.compress( file.getbuffer() ) )
-            close = _close_finalize_zlib
+            file = BufferedWriter( _ZlibFile( target ), 65536 )
         else:
             raise ValueError( "Unknown compression type \"{}\".".format( compression ) )
         w = NBTWriter( file )
-        if close is not None:
-            w.close = MethodType( close, w )
     else:
         w = NBTWriter( target )
     return w
 
+class _ZlibFile( RawIOBase ):
+    """
+    A writable file-like object that zlib compresses the data written to it and writes the result to the file at the given path.
+    Closing it writes the remainder of the compressed data and closes the file.
+    """
+    def __init__( self, path ):
+        self._f = open( path, "wb" )
+        self._c = zlib.compressobj()
+    def writable( self ):
+        return True
+    def write( self, b ):
+        self._f.write( self._c.compress( b ) )
+        return len( b )
+    def close( self ):
+        if not self.closed:
+            try:
+                self._f.write( self._c.flush() )
+            finally:
+                self._f.close()
+                super().close()
+
 class _NBTWriterBase:
     """
     Base class for all other NBTWriter states.
     Implements a context stack and default NBTWriter methods.
     """
+    #Every state shares the same slots so that switching states by assigning to __class__ is possible.
+    #if safe
+    __slots__ = ( "_o", "_s", "_r", "_a", "_b", "_c" )
+    #else
+    __slots__ = ( "_o", "_s" )
+    #end
     def __init__( self, output ):
         """
         Constructor for NBTWriter.
@@ -229,6 +252,7 @@ class _NBTWriterBase:
     def bytes( self, *args, **kwargs ):
         """
         Write the bytes-like object values to the current TAG_Byte_Array.
+        values is written directly, without being copied, so any object supporting the buffer protocol (e.g. a memoryview of a larger buffer) can be written efficiently.
 
         This method may only be called between calls to the .startByteArray() and .endByteArray() methods.
         """
@@ -302,6 +326,23 @@ class _NBTWriterBase:
         This method may only be called in tandem with a prior call to .startList().
         """
         raise NBTFormatError( "Attempted to end a TAG_List, but the current tag is not a TAG_List." )
+    def extend( self, *args, **kwargs ):
+        """
+        Write several tags to the current TAG_List at once.
+
+        tagType is expected to be the list's tagType.
+        All values in values are expected to be the python type corresponding to tagType (e.g. if tagType is jnbt.TAG_FLOAT, we expect each value to be a float).
+        tagType cannot be jnbt.TAG_LIST or jnbt.TAG_COMPOUND; see help( jnbt.NBTWriter.list ) for why.
+        For lists of numbers (TAG_Byte, TAG_Short, TAG_Int, TAG_Long, TAG_Float, and TAG_Double), this is much faster than writing each tag individually,
+        because every value is packed and written in a single call.
+
+        This method may only be called between calls to the .startList() and .endList() methods.
+        Example:
+            writer.startList( "pos", jnbt.TAG_DOUBLE, 3 )
+            writer.extend( jnbt.TAG_DOUBLE, ( 10.5, 64.0, -3.5 ) )
+            writer.endList()
+        """
+        raise NBTFormatError( "Attempted to write tags to a TAG_List, but the current tag is not a TAG_List." )
 
     def startCompound( self, *args, **kwargs ):
         """
@@ -397,11 +438,22 @@ class _NBTWriterBase:
         """
         raise NBTFormatError( "Attempted to end a TAG_Long_Array, but the current tag is not a TAG_Long_Array." )
 
+    def raw( self, *args, **kwargs ):
+        """
+        Write a tag of the given tagType whose payload has already been serialized.
+
+        payload is expected to be a bytes-like object containing the tag's payload exactly as it would appear in an NBT file (i.e. without the tag's type or name).
+        It is written verbatim; it is not checked in any way, so writing a malformed payload will produce a malformed file.
+        This is much faster than writing the tag piece by piece if you already have its serialized form (e.g. a large subtree copied from another file).
+        """
+        raise NBTFormatError( "A tag cannot be created here." )
+
 class _NBTWriterCompound( _NBTWriterBase ):
     """
     Context while writing a (non-root) TAG_Compound.
     Methods in this class take a name as a first argument.
     """
+    __slots__ = ()
     #if safe
     def _ac( self, name ):
         """
@@ -418,61 +470,47 @@ class _NBTWriterCompound( _NBTWriterBase ):
         #if safe
         self._ac( name )
         #end
-        o = self._o
-        _wtn( TAG_BYTE, name, o )
-        _wb( value, o )
+        _wnv( TAG_BYTE, name, value, self._o )
     def short( self, name, value ):
         #if safe
         self._ac( name )
         #end
-        o = self._o
-        _wtn( TAG_SHORT, name, o )
-        _ws( value, o )
+        _wnv( TAG_SHORT, name, value, self._o )
     def int( self, name, value ):
         #if safe
         self._ac( name )
         #end
-        o = self._o
-        _wtn( TAG_INT, name, o )
-        _wi( value, o )
+        _wnv( TAG_INT, name, value, self._o )
     def long( self, name, value ):
         #if safe
         self._ac( name )
         #end
-        o = self._o
-        _wtn( TAG_LONG, name, o )
-        _wl( value, o )
+        _wnv( TAG_LONG, name, value, self._o )
     def float( self, name, value ):
         #if safe
         self._ac( name )
         #end
-        o = self._o
-        _wtn( TAG_FLOAT, name, o )
-        _wf( value, o )
+        _wnv( TAG_FLOAT, name, value, self._o )
     def double( self, name, value ):
         #if safe
         self._ac( name )
         #end
-        o = self._o
-        _wtn( TAG_DOUBLE, name, o )
-        _wd( value, o )
+        _wnv( TAG_DOUBLE, name, value, self._o )
 
     def bytearray( self, name, values ):
         #if safe
         self._ac( name )
         #end
         o = self._o
-        _wtn( TAG_BYTE_ARRAY, name, o )
-        _wba( values, o )
+        _wnv( TAG_BYTE_ARRAY, name, _bl( values ), o )
+        o.write( values )
     def startByteArray( self, name, length ):
         #if safe
         if length < 0 or length > 2147483647:
             raise OutOfBoundsError( length, 0, 2147483647 )
         self._ac( name )
         #end
-        o = self._o
-        _wtn( TAG_BYTE_ARRAY, name, o )
-        _wi( length, o )
+        _wnv( TAG_BYTE_ARRAY, name, length, self._o )
         #if safe
         self._pushBA( length )
         #else
@@ -532,8 +570,8 @@ class _NBTWriterCompound( _NBTWriterBase ):
         #end
         values = _ccria( values )
         o = self._o
-        _wtn( TAG_INT_ARRAY, name, o )
-        _wia( values, o )
+        _wnv( TAG_INT_ARRAY, name, len( values ), o )
+        _wis( values, o )
 
     def startIntArray( self, name, length ):
         #if safe
@@ -541,9 +579,7 @@ class _NBTWriterCompound( _NBTWriterBase ):
             raise OutOfBoundsError( length, 0, 2147483647 )
         self._ac( name )
         #end
-        o = self._o
-        _wtn( TAG_INT_ARRAY, name, o )
-        _wi( length, o )
+        _wnv( TAG_INT_ARRAY, name, length, self._o )
         #if safe
         self._pushIA( length )
         #else
@@ -556,8 +592,8 @@ class _NBTWriterCompound( _NBTWriterBase ):
         #end
         values = _ccrla( values )
         o = self._o
-        _wtn( TAG_LONG_ARRAY, name, o )
-        _wla( values, o )
+        _wnv( TAG_LONG_ARRAY, name, len( values ), o )
+        _wls( values, o )
 
     def startLongArray( self, name, length ):
         #if safe
@@ -565,20 +601,28 @@ class _NBTWriterCompound( _NBTWriterBase ):
             raise OutOfBoundsError( length, 0, 2147483647 )
         self._ac( name )
         #end
-        o = self._o
-        _wtn( TAG_LONG_ARRAY, name, o )
-        _wi( length, o )
+        _wnv( TAG_LONG_ARRAY, name, length, self._o )
         #if safe
         self._pushLA( length )
         #else
         self._pushLA()
         #end
 
+    def raw( self, name, tagType, payload ):
+        #if safe
+        _avtt( tagType )
+        self._ac( name )
+        #end
+        o = self._o
+        _wtn( tagType, name, o )
+        o.write( payload )
+
 class _NBTWriterList( _NBTWriterBase ):
     """
     Context while writing a TAG_List.
     Methods in this class do not take names as arguments.
     """
+    __slots__ = ()
     #if safe
     def _al( self, tagType ):
         """
@@ -656,6 +700,21 @@ class _NBTWriterList( _NBTWriterBase ):
         #end
         _wlp( tagType, values, self._o )
 
+    def extend( self, tagType, values ):
+        #if safe
+        c = self._c
+        if tagType != c:
+            raise WrongTagError( c, tagType )
+        a = self._a + len( values )
+        b = self._b
+        if a > b:
+            raise NBTFormatError( "More than {:d} tags were written.".format( b ) )
+        #end
+        _wts( tagType, values, self._o )
+        #if safe
+        self._a = a
+        #end
+
     def startList( self, tagType, length ):
         #if safe
         if length < 0 or length > 2147483647:
@@ -724,11 +783,18 @@ class _NBTWriterList( _NBTWriterBase ):
         self._pushLA()
         #end
 
+    def raw( self, tagType, payload ):
+        #if safe
+        self._al( tagType )
+        #end
+        self._o.write( payload )
+
 class _NBTWriterByteArray( _NBTWriterBase ):
     """Context while writing a TAG_Byte_Array."""
+    __slots__ = ()
     def bytes( self, values ):
         #if safe
-        a = self._a + len( values )
+        a = self._a + _bl( values )
         b = self._b
         if a > b:
             raise NBTFormatError( "More than {:d} bytes were written.".format( b ) )
@@ -748,6 +814,7 @@ class _NBTWriterByteArray( _NBTWriterBase ):
 
 class _NBTWriterIntArray( _NBTWriterBase ):
     """Context while writing a TAG_Int_Array."""
+    __slots__ = ()
     def ints( self, values ):
         #if safe
         a = self._a + len( values )
@@ -771,6 +838,7 @@ class _NBTWriterIntArray( _NBTWriterBase ):
 
 class _NBTWriterLongArray( _NBTWriterBase ):
     """Context while writing a TAG_Long_Array."""
+    __slots__ = ()
     def longs( self, values ):
         #if safe
         a = self._a + len( values )
@@ -794,6 +862,7 @@ class _NBTWriterLongArray( _NBTWriterBase ):
 
 class _NBTWriterRootCompound( _NBTWriterCompound ):
     """Context while writing the root TAG_Compound."""
+    __slots__ = ()
     def end( self ):
         self._o.write( b"\0" )
         self.__class__ = NBTWriter
@@ -824,6 +893,7 @@ class NBTWriter( _NBTWriterBase ):
 
             writer.end()
     """
+    __slots__ = ()
     def start( self, name="" ):
         #if safe
         if self._r is True:
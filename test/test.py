@@ -1,4 +1,11 @@
+import os
+import sys
+import gzip
+import tempfile
 import unittest
+import zlib
+from io import BytesIO
+from collections import OrderedDict
 
 import jnbt
 
@@ -140,47 +147,190 @@ class TestNBTHandler( jnbt.NBTHandler ):
         self._check( "endLongArray" )
 
 
+def writeExample( w ):
+    """Writes the document described by expected to the given NBTWriter, w."""
+    w.start( "Example!" )
+    w.byte( "byte", -3 )
+    w.short( "short", -500 )
+    w.int( "int", -1234567 )
+    w.long( "long", -12345678910111213 )
+    w.float( "float", 52.358924865722656 )
+    w.double( "double", 123.456789101112 )
+    w.string( "string", "This is a string!" )
+    w.startCompound( "compound" )
+    w.string( "name", "Jeff" )
+    w.int( "id", 5 )
+    w.endCompound()
+    w.list( "list", jnbt.TAG_STRING, ( "Hey!", "Check", "out", "these", "strings!" ) )
+    w.startList( "list2", jnbt.TAG_FLOAT, 4 )
+    w.float( 10.2 )
+    w.float( 15.6 )
+    w.float( 17.1 )
+    w.float( -1.12 )
+    w.endList()
+    w.bytearray( "bytearray", b"\x00\x01\x02\x03" )
+    w.startByteArray( "bytearray2", 4 )
+    w.bytes( b"\x04\x05" )
+    w.bytes( b"\x06\x07" )
+    w.endByteArray()
+    w.intarray( "intarray", ( 5, 6, 7, 8 ) )
+    w.startIntArray( "intarray2", 4 )
+    w.ints( (  9, 10 ) )
+    w.ints( ( 11, 12 ) )
+    w.endIntArray()
+    w.longarray( "longarray", ( 13, 14, 15, 16 ) )
+    w.startLongArray( "longarray2", 4 )
+    w.longs( ( 17, 18 ) )
+    w.longs( ( 19, 20 ) )
+    w.endLongArray()
+    w.end()
+
+def writeLarge( w ):
+    """Writes a document to the given NBTWriter, w, that is much larger than the buffer jnbt.writer() places in front of compressed files."""
+    w.start()
+    for i in range( 1000 ):
+        w.startCompound( "compound{:d}".format( i ) )
+        w.intarray( "ints", range( 64 ) )
+        w.string( "string", "This is a string!" )
+        w.endCompound()
+    w.end()
+
 class TestJNBT( unittest.TestCase ):
     def test_parse( self):
         for source, compression in ( ( "raw.nbt", None ), ( "gzip.nbt", "gzip" ), ( "zlib.nbt", "zlib" ) ):
             self.assertTrue( jnbt.parse( source, TestNBTHandler(), compression ) )
     def test_NBTWriter( self ):
-        with jnbt.writer( "write_test.nbt", None ) as w:
-            w.start( "Example!" )
-            w.byte( "byte", -3 )
-            w.short( "short", -500 )
-            w.int( "int", -1234567 )
-            w.long( "long", -12345678910111213 )
-            w.float( "float", 52.358924865722656 )
-            w.double( "double", 123.456789101112 )
-            w.string( "string", "This is a string!" )
-            w.startCompound( "compound" )
-            w.string( "name", "Jeff" )
-            w.int( "id", 5 )
-            w.endCompound()
-            w.list( "list", jnbt.TAG_STRING, ( "Hey!", "Check", "out", "these", "strings!" ) )
-            w.startList( "list2", jnbt.TAG_FLOAT, 4 )
-            w.float( 10.2 )
-            w.float( 15.6 )
-            w.float( 17.1 )
-            w.float( -1.12 )
-            w.endList()
-            w.bytearray( "bytearray", b"\x00\x01\x02\x03" )
-            w.startByteArray( "bytearray2", 4 )
-            w.bytes( b"\x04\x05" )
-            w.bytes( b"\x06\x07" )
-            w.endByteArray()
-            w.intarray( "intarray", ( 5, 6, 7, 8 ) )
-            w.startIntArray( "intarray2", 4 )
-            w.ints( (  9, 10 ) )
-            w.ints( ( 11, 12 ) )
-            w.endIntArray()
-            w.longarray( "longarray", ( 13, 14, 15, 16 ) )
-            w.startLongArray( "longarray2", 4 )
-            w.longs( ( 17, 18 ) )
-            w.longs( ( 19, 20 ) )
-            w.endLongArray()
-            w.end()
+        #Writing the same document the parse test expects should reproduce raw.nbt byte-for-byte
+        buffer = BytesIO()
+        writeExample( jnbt.NBTWriter( buffer ) )
+
+        with open( "raw.nbt", "rb" ) as file:
+            self.assertEqual( buffer.getvalue(), file.read() )
+    def test_writer( self ):
+        #Documents written to a file with jnbt.writer() should be complete and readable once the writer is closed, for every compression type
+        with tempfile.TemporaryDirectory() as directory:
+            for compression in ( None, "gzip", "zlib" ):
+                path = os.path.join( directory, "{}.nbt".format( compression ) )
+                with jnbt.writer( path, compression ) as w:
+                    writeExample( w )
+                self.assertTrue( jnbt.parse( path, TestNBTHandler(), compression ) )
+    def test_writer_gzip( self ):
+        #Gzip output is buffered; once the writer is closed, the file should be a complete gzip stream of the document
+        uncompressed = BytesIO()
+        writeLarge( jnbt.NBTWriter( uncompressed ) )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join( directory, "large.nbt" )
+            with jnbt.writer( path, "gzip" ) as w:
+                writeLarge( w )
+            with open( path, "rb" ) as file:
+                self.assertEqual( gzip.decompress( file.read() ), uncompressed.getvalue() )
+    def test_writer_zlib( self ):
+        #Zlib output is compressed as it's written; once the writer is closed, the file should be a complete zlib stream of the document
+        uncompressed = BytesIO()
+        writeLarge( jnbt.NBTWriter( uncompressed ) )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join( directory, "large.nbt" )
+            w = jnbt.writer( path, "zlib" )
+            writeLarge( w )
+            w.close()
+            #Closing an already closed writer should do nothing
+            w.close()
+            with open( path, "rb" ) as file:
+                self.assertEqual( zlib.decompress( file.read() ), uncompressed.getvalue() )
+    def test_NBTWriter_raw( self ):
+        #Writing pre-serialized payloads with .raw() should produce the same bytes as writing the tags normally
+        typed = BytesIO()
+        w = jnbt.NBTWriter( typed )
+        w.start()
+        w.startCompound( "compound" )
+        w.int( "id", 5 )
+        w.endCompound()
+        w.startList( "list", jnbt.TAG_SHORT, 2 )
+        w.short( 1 )
+        w.short( 2 )
+        w.endList()
+        w.end()
+
+        raw = BytesIO()
+        w = jnbt.NBTWriter( raw )
+        w.start()
+        w.raw( "compound", jnbt.TAG_COMPOUND, b"\x03\x00\x02id\x00\x00\x00\x05\x00" )
+        w.startList( "list", jnbt.TAG_SHORT, 2 )
+        w.raw( jnbt.TAG_SHORT, b"\x00\x01" )
+        w.raw( jnbt.TAG_SHORT, b"\x00\x02" )
+        w.endList()
+        w.end()
+
+        self.assertEqual( typed.getvalue(), raw.getvalue() )
+    def test_NBTWriter_extend( self ):
+        #Writing a list's tags with .extend() should produce the same bytes as writing them one at a time
+        values = ( 1.5, -2.25, 1e10 )
+        single = BytesIO()
+        w = jnbt.NBTWriter( single )
+        w.start()
+        w.startList( "list", jnbt.TAG_DOUBLE, 3 )
+        for v in values:
+            w.double( v )
+        w.endList()
+        w.end()
+
+        batch = BytesIO()
+        w = jnbt.NBTWriter( batch )
+        w.start()
+        w.startList( "list", jnbt.TAG_DOUBLE, 3 )
+        w.extend( jnbt.TAG_DOUBLE, values )
+        w.endList()
+        w.end()
+
+        self.assertEqual( single.getvalue(), batch.getvalue() )
+    @unittest.skipIf( sys.version_info < ( 3, 7 ), "TAG_Compound is based on OrderedDict before Python 3.7" )
+    def test_TAG_Compound_dict( self ):
+        #Since Python 3.7, TAG_Compound is a dict subclass; pin down the behavior that differs from OrderedDict
+        a = jnbt.TAG_Compound()
+        a.int( "a", 1 )
+        a.int( "b", 2 )
+        b = jnbt.TAG_Compound()
+        b.int( "b", 2 )
+        b.int( "a", 1 )
+        self.assertNotIsInstance( a, OrderedDict )
+        self.assertEqual( a, b )
+        self.assertEqual( repr( a ), "TAG_Compound({'a': TAG_Int(1), 'b': TAG_Int(2)})" )
+        with self.assertRaises( AttributeError ):
+            a.foo = 1
+    def test_TAG_Compound_order( self ):
+        #TAG_Compound should support OrderedDict's order-related methods on every Python version
+        c = jnbt.TAG_Compound()
+        c.int( "a", 1 )
+        c.int( "b", 2 )
+        c.int( "c", 3 )
+        c.move_to_end( "a" )
+        self.assertEqual( list( c ), [ "b", "c", "a" ] )
+        c.move_to_end( "a", last=False )
+        self.assertEqual( list( c ), [ "a", "b", "c" ] )
+        with self.assertRaises( KeyError ):
+            c.move_to_end( "d" )
+
+        self.assertEqual( c.popitem( last=False ), ( "a", jnbt.TAG_Int( 1 ) ) )
+        self.assertEqual( c.popitem(), ( "c", jnbt.TAG_Int( 3 ) ) )
+        self.assertEqual( c.popitem(), ( "b", jnbt.TAG_Int( 2 ) ) )
+        with self.assertRaises( KeyError ):
+            c.popitem()
+        with self.assertRaises( KeyError ):
+            c.popitem( last=False )
+    def test_TAG_List_setitem_range( self ):
+        #Out-of-range assignment should raise IndexError, even if the value would need converting
+        l = jnbt.TAG_List( listTagType=jnbt.TAG_Int )
+        with self.assertRaises( IndexError ):
+            l[0] = jnbt.TAG_Int( 1 )
+        l = jnbt.TAG_List( ( jnbt.TAG_Int( 1 ), jnbt.TAG_Int( 2 ) ) )
+        for i in ( 2, -3 ):
+            with self.assertRaises( IndexError ):
+                l[i] = "not an int"
+            with self.assertRaises( IndexError ):
+                l[i] = jnbt.TAG_String( "x" )
+        l[-1] = 5
+        self.assertEqual( l, [ jnbt.TAG_Int( 1 ), jnbt.TAG_Int( 5 ) ] )
+        self.assertEqual( l.listTagType, jnbt.TAG_INT )
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file